@@ -0,0 +1,264 @@
+"""
+Benchmarks of syntheticus_client against the in-process stub server.
+
+Every scenario runs in its own process so its peak RSS is measured in
+isolation, while the stub server runs in the parent process.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scale 100 --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --tolerance 0.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import stub_server, stub_state  # noqa: E402
+
+IRIS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset', 'iris.csv')
+
+# modules a headless `import syntheticus_connect` must not load
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'tabulate', 'ruamel', 'yaml', 'IPython', 'ipywidgets', 'aiohttp')
+
+# metric name -> True when higher is better
+DIRECTIONS = {
+    'import_ms': False,
+    'login_p50_ms': False,
+    'login_p95_ms': False,
+    'catalog_items_per_s': True,
+    'upload_mb_per_s': True,
+    'download_mb_per_s': True,
+    'peak_rss_mb': False,
+}
+
+
+def scaled_csv(path, scale):
+    """
+    Write iris.csv repeated ``scale`` times.
+
+    Args:
+        path (str): The destination file.
+        scale (int): The number of copies of the iris rows.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+    with open(IRIS_PATH, 'rb') as f:
+        header = f.readline()
+        rows = f.read()
+    with open(path, 'wb') as f:
+        f.write(header)
+        for _ in range(scale):
+            f.write(rows)
+    return os.path.getsize(path)
+
+
+def synth_payload(scale):
+    import pandas as pd
+    df = pd.read_csv(IRIS_PATH)
+    return pickle.dumps(pd.concat([df] * scale, ignore_index=True))
+
+
+def _client(url):
+    from syntheticus_connect.syntheticus_client import syntheticus_client
+    client = syntheticus_client(url)
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.login('stub', 'stub')
+    return client
+
+
+def bench_login(url, scale, workdir, repeat=200):
+    from syntheticus_connect.syntheticus_client import syntheticus_client
+    client = syntheticus_client(url)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.login('stub', 'stub')
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {'login_p50_ms': statistics.median(timings), 'login_p95_ms': timings[int(len(timings) * 0.95) - 1]}
+
+
+def bench_catalog(url, scale, workdir):
+    client = _client(url)
+    start = time.perf_counter()
+    projects = list(client.iter_projects(page_size=100))
+    count = len(projects)
+    count += sum(1 for _ in client.iter_datasets(projects[0]['id'] if projects else '0', page_size=100))
+    count += sum(1 for _ in client.iter_models(page_size=100))
+    return {'catalog_items_per_s': count / (time.perf_counter() - start)}
+
+
+def bench_upload(url, scale, workdir):
+    client = _client(url)
+    path = os.path.join(workdir, 'data.csv')
+    size = scaled_csv(path, scale)
+    client.projects = {'p': 'bench'}
+    client.project_id = 'p'
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.upload_data('bench', workdir, ['data.csv'], stream=True)
+    return {'upload_mb_per_s': size / 1e6 / (time.perf_counter() - start)}
+
+
+def bench_download(url, scale, workdir):
+    client = _client(url)
+    os.chdir(workdir)
+    client.project_id = 'p'
+    client.project_name = 'bench'
+    client.dataset_name = 'bench'
+    client.commit = '0' * 40
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.download_data('data_synth', output_format='csv', max_workers=1)
+    size = os.path.getsize('bench_synth.zip')
+    return {'download_mb_per_s': size / 1e6 / (time.perf_counter() - start)}
+
+
+def bench_import(url, scale, workdir, repeat=5):
+    # every measure runs in a fresh interpreter, the best of `repeat` cold imports is kept
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import syntheticus_connect\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"heavy = sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)\n"
+        "print(json.dumps({'import_ms': elapsed, 'heavy_modules': heavy}))\n"
+    )
+    runs = [json.loads(subprocess.check_output([sys.executable, '-c', code], cwd=root)) for _ in range(repeat)]
+    return {'import_ms': min(run['import_ms'] for run in runs), 'heavy_modules': runs[0]['heavy_modules']}
+
+
+SCENARIOS = {
+    'import': bench_import,
+    'login': bench_login,
+    'catalog': bench_catalog,
+    'upload': bench_upload,
+    'download': bench_download,
+}
+
+
+def _run_scenario(name, url, scale, queue):
+    with tempfile.TemporaryDirectory() as workdir:
+        result = SCENARIOS[name](url, scale, workdir)
+    result['peak_rss_mb'] = peak_rss_mb()
+    queue.put(result)
+
+
+def peak_rss_mb():
+    # ru_maxrss survives exec on Linux, so a spawned child would report the peak of
+    # its parent: read the high-water mark of the process' own memory map instead
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run(scenarios, scale):
+    """
+    Run the scenarios against a fresh stub server.
+
+    Args:
+        scenarios (list): The scenario names.
+        scale (int): How many times the iris dataset is repeated for uploads and downloads.
+
+    Returns:
+        dict: The metrics of every scenario.
+    """
+    results = {}
+    payload = synth_payload(scale) if 'download' in scenarios else b''
+    # spawned, not forked: a forked child would inherit pandas and the payload of the
+    # parent and its peak RSS would measure the parent instead of the scenario
+    context = multiprocessing.get_context('spawn')
+    with stub_server(stub_state(synth_payload=payload)) as server:
+        for name in scenarios:
+            queue = context.Queue()
+            process = context.Process(target=_run_scenario, args=(name, server.url, scale, queue))
+            process.start()
+            results[name] = queue.get()
+            process.join()
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): The current metrics.
+        baseline (dict): The reference metrics.
+        tolerance (float): The allowed relative degradation, e.g. 0.25 for 25%.
+
+    Returns:
+        list: A message for every metric worse than the baseline by more than the tolerance.
+    """
+    messages = []
+    for scenario, metrics in results.items():
+        for metric, value in metrics.items():
+            if metric not in DIRECTIONS:
+                continue
+            reference = baseline.get(scenario, {}).get(metric)
+            if not reference:
+                continue
+            change = (value - reference) / reference
+            worse = -change if DIRECTIONS[metric] else change
+            if worse > tolerance:
+                messages.append(f"{scenario}.{metric}: {value:.2f} vs baseline {reference:.2f} ({change:+.0%})")
+    return messages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run, can be repeated (default: all)')
+    parser.add_argument('--scale', type=int, default=20000,
+                        help='number of copies of iris.csv in the upload and download datasets (default: 20000, about 90 MB)')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='fail if the results regress from this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative regression (default: 0.25)')
+    parser.add_argument('--import-budget-ms', type=float, default=500,
+                        help='fail if importing syntheticus_connect takes longer (default: 500)')
+    args = parser.parse_args(argv)
+
+    results = run(args.scenario or list(SCENARIOS), args.scale)
+    print(json.dumps(results, indent=4))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+
+    failures = []
+    if 'import' in results:
+        if results['import']['import_ms'] > args.import_budget_ms:
+            failures.append(f"import.import_ms: {results['import']['import_ms']:.0f} ms over the "
+                            f"{args.import_budget_ms:.0f} ms budget")
+        if results['import']['heavy_modules']:
+            failures.append(f"import.heavy_modules: {', '.join(results['import']['heavy_modules'])} loaded at import")
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += regressions(results, json.load(f), args.tolerance)
+    for message in failures:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Functional checks of syntheticus_client against the in-process stub server.
+
+The benchmarks measure how fast the client is, these checks verify behaviours
+that only show against a server: recovery from rejected tokens, retries of
+failed shards. Every check runs against its own stub.
+
+Usage:
+    python benchmarks/run_checks.py
+    python benchmarks/run_checks.py --check reauth
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_server import TOKEN, stub_server, stub_state  # noqa: E402
+
+
+def _client(url):
+    from syntheticus_connect.syntheticus_client import syntheticus_client
+    client = syntheticus_client(url)
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.login('stub', 'stub')
+    return client
+
+
+def check_reauth(server):
+    # every call must log in again after a 401 and replay with the new token
+    client = _client(server.url)
+    project_id = server.state.projects[0]['id']
+    calls = {
+        'list_commits': lambda: len(client.list_commits(show=False, context=client.current_context()
+                                                         .with_project(project_id))) == len(server.state.commits),
+        'fit': lambda: client._trigger_fit(project_id, 'model_0')['dag_run_id'].startswith('run_'),
+        'download': lambda: client._request_download(project_id, '0' * 40, 'report').status_code == 200,
+        'get_projects': lambda: len(client.get_projects(show=False)) == len(server.state.projects),
+    }
+    for name, call in calls.items():
+        client.token = 'expired'
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert call(), f"{name} did not recover from a 401"
+        assert client.token == TOKEN, f"{name} did not refresh the token"
+
+
+def _shard_upload(server, retries):
+    client = _client(server.url)
+    client.projects = {'p': 'checks'}
+    with tempfile.TemporaryDirectory() as folder:
+        with open(os.path.join(folder, 'data.csv'), 'w') as f:
+            f.write('a,b\n' + ''.join(f'{i},{i * 2}\n' for i in range(2000)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            return client.upload_data_sharded('checks', folder, 'data.csv', shard_size=4096, retries=retries,
+                                              context=client.current_context().with_project('p'))
+
+
+def check_sharded_upload(server):
+    # the failed shards are retried on their own and the folder is only finalised once all are in
+    server.state.fail_shards = {1: 1, 3: 2}
+    result = _shard_upload(server, retries=2)
+    assert result['finalized'], result
+    attempts = {shard['index']: shard['attempts'] for shard in result['shards']}
+    assert len(attempts) > 4, f"expected more than 4 shards, got {len(attempts)}"
+    assert attempts == {index: 1 + {1: 1, 3: 2}.get(index, 0) for index in attempts}, attempts
+    events = server.state.upload_events
+    assert events[-1] == ('finalize', None, 200) and [event[0] for event in events].count('finalize') == 1, events
+    assert {event[1] for event in events if event[2] == 200 and event[0] == 'shard'} == set(attempts), events
+
+    # a shard failing more than `retries` times leaves the folder unfinalised
+    server.state.upload_events.clear()
+    server.state.fail_shards = {2: 5}
+    result = _shard_upload(server, retries=1)
+    assert not result['finalized'], result
+    assert [shard['index'] for shard in result['shards'] if shard['status'] != 'ok'] == [2], result
+    assert all(event[0] == 'shard' for event in server.state.upload_events), server.state.upload_events
+
+
+def check_async_slow_download(server):
+    # a download longer than the read timeout completes as long as every chunk arrives in time
+    from syntheticus_connect.syntheticus_async import syntheticus_async_client
+    server.state.archive = os.urandom(1024 * 1024)
+    server.state.chunk_delay = 0.1 # 16 chunks, about 1.6 s in total
+
+    async def download(path):
+        async with syntheticus_async_client(server.url, timeout=(5, 0.5)) as client:
+            await client.login('stub', 'stub')
+            return await client.download_data('p', '0' * 40, 'data_synth', path)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'synth.zip')
+        written = asyncio.run(download(path))
+        assert written == len(server.state.archive) == os.path.getsize(path), written
+
+
+CHECKS = {
+    'reauth': check_reauth,
+    'sharded_upload': check_sharded_upload,
+    'async_slow_download': check_async_slow_download,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--check', action='append', choices=sorted(CHECKS),
+                        help='check to run, can be repeated (default: all)')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for name in args.check or list(CHECKS):
+        with stub_server(stub_state(n_projects=20, n_datasets=5)) as server:
+            try:
+                CHECKS[name](server)
+            except Exception:
+                failures += 1
+                print(f"FAIL {name}", file=sys.stderr)
+                traceback.print_exc()
+            else:
+                print(f"ok   {name}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
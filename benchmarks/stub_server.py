@@ -0,0 +1,250 @@
+"""
+An in-process stub of the Syntheticus and Airflow APIs used by the benchmarks.
+
+The stub implements the endpoints called by syntheticus_client with realistic
+payloads (paginated listings, multipart uploads, zipped pickles) but no
+business logic, so the benchmarks measure the client and not a server.
+"""
+import io
+import json
+import pickle
+import re
+import threading
+import time
+import uuid
+import zipfile
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+TOKEN = 'stub-token'
+
+
+class stub_state:
+    """
+    The data served by the stub.
+    """
+    def __init__(self, n_projects=500, n_datasets=200, n_models=50, n_commits=20, synth_payload=b'',
+                 fail_shards=None, chunk_delay=0.0):
+        """
+        Build the catalog.
+
+        Args:
+            n_projects (int): The number of projects.
+            n_datasets (int): The number of dataset folders in every project.
+            n_models (int): The number of Airflow DAGs.
+            n_commits (int): The number of commits in every project.
+            synth_payload (bytes): The pickled DataFrame served as synthetic data.
+            fail_shards (dict): Shard index -> the number of uploads of that shard answered
+                with a 503 before it is accepted.
+            chunk_delay (float): Seconds slept between the 64 KB chunks of a downloaded
+                archive, to simulate a slow but steady stream.
+        """
+        created_at = datetime(2024, 1, 1).isoformat()
+        self.projects = [{'id': str(uuid.UUID(int=i)), 'name': f'project_{i}', 'created_at': created_at}
+                         for i in range(n_projects)]
+        self.datasets = [{
+            'id': str(uuid.UUID(int=10 ** 6 + i)), 'project': None, 'data_type': 'single_table',
+            'datasets': [{'dataset_name': f'dataset_{i}', 'datasets': [{
+                'dataset_name': f'dataset_{i}', 'size': 4607, 'rows_number': 150,
+                'dataset_metadata': {'column_types': {'a': 'float', 'b': 'float', 'c': 'categorical'}},
+            }]}],
+        } for i in range(n_datasets)]
+        self.models = [{'dag_id': f'model_{i}', 'description': f'Stub model {i}'} for i in range(n_models)]
+        self.commits = [{'commit': f'{i:040x}', 'subject': f'experiment {i}'} for i in range(n_commits)]
+        self.archive = self._archive(synth_payload)
+        self.uploaded_bytes = 0
+        self.fail_shards = dict(fail_shards or {})
+        self.chunk_delay = chunk_delay
+        self.upload_events = [] # ('shard', index, status) and ('finalize', None, status) in arrival order
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _archive(payload):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as z:
+            z.writestr('data_synth.pkl', payload or pickle.dumps({}))
+        return buffer.getvalue()
+
+
+def _page(items, query, base_url):
+    page = int(query.get('page', ['1'])[0])
+    page_size = int(query.get('page_size', ['100'])[0])
+    start = (page - 1) * page_size
+    next_url = f"{base_url}?page={page + 1}&page_size={page_size}" if start + page_size < len(items) else None
+    return {'count': len(items), 'next': next_url, 'results': items[start:start + page_size]}
+
+
+class stub_handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, every response has a Content-Length
+    # headers and body go out in separate writes, without TCP_NODELAY every request waits on a delayed ACK
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', content_type='application/json', headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_slowly(self, body, content_type, chunk_size=64 * 1024):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        for start in range(0, len(body), chunk_size):
+            self.wfile.write(body[start:start + chunk_size])
+            self.wfile.flush()
+            time.sleep(self.state.chunk_delay)
+
+    def _send_json_cached(self, data):
+        body = json.dumps(data).encode()
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, headers={'ETag': etag})
+        else:
+            self._send(200, body, headers={'ETag': etag})
+
+    def _drain(self, keep=0):
+        # read the request body in chunks, only keeping its first `keep` bytes
+        remaining = int(self.headers.get('Content-Length') or 0)
+        total = remaining
+        head = b''
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            if len(head) < keep:
+                head += chunk[:keep - len(head)]
+            remaining -= len(chunk)
+        return (total, head) if keep else total
+
+    def _upload(self):
+        # the form fields precede the files in the multipart body
+        received, head = self._drain(keep=64 * 1024)
+        fields = dict(re.findall(rb'name="([^"]+)"\r\n\r\n([^\r]*)\r\n', head))
+        status = 200
+        with self.state.lock:
+            self.state.uploaded_bytes += received
+            if b'shard_index' in fields:
+                index = int(fields[b'shard_index'])
+                if self.state.fail_shards.get(index, 0) > 0:
+                    self.state.fail_shards[index] -= 1
+                    status = 503
+                self.state.upload_events.append(('shard', index, status))
+            elif fields.get(b'finalize') == b'true':
+                self.state.upload_events.append(('finalize', None, status))
+        self._send(status, {'detail': 'ok' if status == 200 else 'Shard rejected.'})
+
+    def _authorized(self):
+        authorization = self.headers.get('Authorization', '')
+        if authorization == f'Token {TOKEN}' or authorization.startswith('Basic '):
+            return True
+        self._drain()
+        self._send(401, {'detail': 'Invalid token.'})
+        return False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        base_url = f"http://{self.headers.get('Host')}{url.path}"
+        if not self._authorized():
+            return
+        if url.path == '/api/projects/':
+            self._send_json_cached(_page(self.state.projects, query, base_url))
+        elif len(parts) == 4 and parts[3] == 'list-dataset-folders':
+            self._send_json_cached(_page(self.state.datasets, query, base_url))
+        elif len(parts) == 4 and parts[3] == 'commit-logs':
+            self._send_json_cached(self.state.commits)
+        elif url.path == '/api/users/me/':
+            self._send(200, {'username': 'stub', 'name': 'Stub User', 'url': base_url})
+        elif url.path == '/api/v1/dags':
+            limit = int(query.get('limit', ['100'])[0])
+            offset = int(query.get('offset', ['0'])[0])
+            self._send_json_cached({'dags': self.state.models[offset:offset + limit],
+                                    'total_entries': len(self.state.models)})
+        else:
+            self._send(404, {'detail': 'Not found.'})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        if url.path == '/dj-rest-auth/login/':
+            self._drain()
+            self._send(200, {'key': TOKEN})
+            return
+        if not self._authorized():
+            return
+        if url.path == '/dj-rest-auth/logout/':
+            self._drain()
+            self._send(200, {'detail': 'Successfully logged out.'})
+        elif url.path == '/api/projects/':
+            self._drain()
+            self._send(201, {'id': str(uuid.uuid4()), 'name': 'new', 'created_at': datetime.now().isoformat()})
+        elif len(parts) == 4 and parts[3] == 'upload-data':
+            self._upload()
+        elif len(parts) == 4 and parts[3] == 'update-conf-file':
+            received = self._drain()
+            with self.state.lock:
+                self.state.uploaded_bytes += received
+            self._send(200, {'detail': 'ok'})
+        elif len(parts) == 4 and parts[3] == 'run-dag':
+            self._drain()
+            run = {'dag_id': 'model_0', 'dag_run_id': f'run_{uuid.uuid4().hex}', 'state': 'queued',
+                   'execution_date': datetime.now().isoformat(), 'conf': {'project_name': parts[2]}}
+            self._send(200, [json.dumps(run)])
+        elif len(parts) == 4 and parts[3] == 'download-airflow-data':
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if body.get('data_to_download') in ('data_synth', 'data_real'):
+                if self.state.chunk_delay:
+                    self._send_slowly(self.state.archive, 'application/zip')
+                else:
+                    self._send(200, self.state.archive, 'application/zip')
+            else:
+                self._send(200, b'%PDF-1.4 stub', 'application/pdf')
+        elif url.path == '/api/v1/dags/~/dagRuns/list':
+            length = int(self.headers.get('Content-Length') or 0)
+            json.loads(self.rfile.read(length) or b'{}')
+            self._send(200, {'dag_runs': [], 'total_entries': 0})
+        else:
+            self._drain()
+            self._send(404, {'detail': 'Not found.'})
+
+    def do_DELETE(self):
+        if self._authorized():
+            self._send(204)
+
+
+class stub_server:
+    """
+    Run the stub on a background thread.
+
+    Example:
+        with stub_server() as server:
+            client = syntheticus_client(server.url)
+    """
+    def __init__(self, state=None, host='127.0.0.1', port=0):
+        handler = type('bound_stub_handler', (stub_handler,), {'state': state or stub_state()})
+        self.state = handler.state
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -12,8 +12,17 @@ setup(
         'pandas',
         'tabulate',
         'ipywidgets',
-        'ipython'
+        'ipython',
+        'ruamel.yaml'
     ],
+    entry_points={
+        'console_scripts': ['syntheticus=syntheticus_connect.syntheticus_cli:main'],
+    },
+    extras_require={
+        'async': ['aiohttp'],
+        'arrow': ['pyarrow'],
+        'zstd': ['zstandard'],
+    },
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
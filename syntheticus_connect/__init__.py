@@ -1,2 +1,33 @@
 from .syntheticus_client import syntheticus_client
-from .syntheticus_interact import syntheticus_interface
\ No newline at end of file
+from .syntheticus_catalog import syntheticus_catalog
+from .syntheticus_context import request_context
+from .syntheticus_config import validate_config
+from .syntheticus_records import commit_record, dataset_record, model_record, print_records, project_record, user_record
+
+# everything else is imported on first access, so that `import syntheticus_connect`
+# in a headless batch job does not load pandas, pyarrow, aiohttp or the notebook stack
+_LAZY_ATTRIBUTES = {
+    'syntheticus_async_client': '.syntheticus_async',
+    'syntheticus_dataset': '.syntheticus_dataset',
+    'syntheticus_run_monitor': '.syntheticus_runs',
+    'batch_job': '.syntheticus_batch',
+    'run_batch': '.syntheticus_batch',
+    'infer_metadata': '.syntheticus_metadata',
+    'write_metadata': '.syntheticus_metadata',
+    'syntheticus_metrics': '.syntheticus_metrics',
+    'syntheticus_interface': '.syntheticus_interact',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,315 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+from .syntheticus_client import syntheticus_client
+from .syntheticus_config import dump_config, validate_config
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class syntheticus_async_client:
+    """
+    An asyncio counterpart of syntheticus_client.
+
+    Every operation is a coroutine that takes the project, dataset, model or commit
+    it acts on as an argument, so one client can drive many projects concurrently
+    from a single event loop. The number of in-flight requests is capped by
+    ``max_concurrency``.
+
+    Example:
+        async with syntheticus_async_client(host) as client:
+            await client.login(username, password)
+            projects = await client.get_projects()
+    """
+    def __init__(self, host, max_concurrency=100, timeout=(5, 60), airflow_auth=('airflow', 'airflow')):
+        """
+        Initialize the async client.
+
+        Args:
+            host (str): The base URL of the API.
+            max_concurrency (int): The maximum number of requests in flight at once.
+            timeout (float or tuple): The (connect, read) timeouts in seconds, as for the sync
+                transport. The read timeout bounds the wait for every chunk, not the whole
+                request, so long transfers are not aborted while bytes keep flowing.
+            airflow_auth (tuple): Basic auth credentials used for the Airflow API.
+        """
+        if aiohttp is None:
+            raise ImportError("syntheticus_async_client requires aiohttp: pip install syntheticus_connect[async]")
+        self.host = host
+        self.host_airflow = host
+        self.token = None # user token assigned at login
+        self.main_data_dir = './media/' # directory in syntheticus nav
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.airflow_auth = airflow_auth # airflow credentials will be deprecated
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            connect, read = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=None, connect=connect,
+                                                                                sock_read=read))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _authorized_headers(self):
+        return {'Authorization': f'Token {self.token}'} if self.token else {}
+
+    async def _request(self, method, url, airflow=False, **kwargs):
+        """
+        Send a request and return the status code and the body.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The full URL.
+            airflow (bool): Use the Airflow basic auth instead of the user token.
+            **kwargs: Passed through to ``aiohttp.ClientSession.request``.
+
+        Returns:
+            tuple: The status code and the response body as text.
+        """
+        session = self._get_session()
+        if airflow:
+            kwargs['auth'] = aiohttp.BasicAuth(*self.airflow_auth)
+        else:
+            kwargs['headers'] = {**self._authorized_headers(), **kwargs.get('headers', {})}
+        async with self._semaphore:
+            async with session.request(method, url, **kwargs) as response:
+                return response.status, await response.text()
+
+    async def _request_json(self, method, url, **kwargs):
+        status, text = await self._request(method, url, **kwargs)
+        if status // 100 != 2:
+            raise RuntimeError(f"{method} {url} failed with HTTP {status}: {text}")
+        return json.loads(text) if text else None
+
+    async def login(self, username, password):
+        """
+        Log in to the API.
+
+        Args:
+            username (str): The username for authentication.
+            password (str): The password for authentication.
+
+        Returns:
+            str: The login status message.
+        """
+        url = f"{self.host}/dj-rest-auth/login/"
+        status, text = await self._request('POST', url, json={"username": username, "password": password})
+        if status == 200:
+            self.token = json.loads(text).get('key')
+            return "Login successful."
+        return f"Login failed. Status code: {status}"
+
+    async def logout(self):
+        """
+        Log out from the API.
+
+        Returns:
+            str: The response text from the logout request.
+        """
+        _, text = await self._request('POST', f"{self.host}/dj-rest-auth/logout/")
+        return text
+
+    async def _get_all_pages(self, url, page_size):
+        # follow the next links of a paginated Django REST listing, they carry the query parameters
+        items = []
+        params = {'page_size': page_size}
+        while url:
+            data = await self._request_json('GET', url, params=params)
+            if not isinstance(data, dict):
+                return items + (data or [])
+            items += data.get('results', [])
+            url, params = data.get('next'), None
+        return items
+
+    async def get_projects(self, page_size=100):
+        """
+        Get the list of projects, walking all the pages of the listing.
+
+        Args:
+            page_size (int): The number of projects requested per page.
+
+        Returns:
+            list: The project dictionaries.
+        """
+        return await self._get_all_pages(f"{self.host}/api/projects/", page_size)
+
+    async def get_datasets(self, project_id, page_size=100):
+        """
+        List the dataset folders for a project, walking all the pages of the listing.
+
+        Args:
+            project_id (str): The ID of the project.
+            page_size (int): The number of dataset folders requested per page.
+
+        Returns:
+            list: The dataset folder dictionaries.
+        """
+        return await self._get_all_pages(f"{self.host}/api/projects/{project_id}/list-dataset-folders/", page_size)
+
+    async def get_models(self, page_size=100):
+        """
+        List all the available models, walking all the pages of the Airflow listing.
+
+        Args:
+            page_size (int): The number of DAGs requested per page.
+
+        Returns:
+            list: The Airflow DAG dictionaries.
+        """
+        url = f"{self.host_airflow}/api/v1/dags"
+        dags = []
+        while True:
+            data = await self._request_json('GET', url, airflow=True, params={'limit': page_size, 'offset': len(dags)})
+            page = data.get('dags', [])
+            dags += page
+            if not page or len(dags) >= data.get('total_entries', 0):
+                return dags
+
+    async def list_commits(self, project_id):
+        """
+        List the commits of a project.
+
+        Args:
+            project_id (str): The ID of the project.
+
+        Returns:
+            list: The commit dictionaries.
+        """
+        return await self._request_json('GET', f"{self.host}/api/projects/{project_id}/commit-logs/")
+
+    async def upload_data(self, project_id, dataset_name, folder_path, file_names):
+        """
+        Upload data files into a dataset folder of a project.
+
+        Args:
+            project_id (str): The ID of the project.
+            dataset_name (str): The name of the dataset folder.
+            folder_path (str): The local folder containing the files.
+            file_names (list): The names of the files to upload.
+
+        Returns:
+            bool: True if the files were uploaded successfully.
+        """
+        url = f"{self.host}/api/projects/{project_id}/upload-data/"
+        form = aiohttp.FormData()
+        form.add_field('dataset_folder_name', dataset_name)
+        handles = []
+        try:
+            for file_name in file_names:
+                handle = open(os.path.join(folder_path, file_name), 'rb')
+                handles.append(handle)
+                form.add_field('files', handle, filename=file_name,
+                               content_type=syntheticus_client.get_mime_type(file_name))
+            status, _ = await self._request('POST', url, data=form)
+        finally:
+            for handle in handles:
+                handle.close()
+        return status == 200
+
+    async def upload_conf(self, project_id, config_data, file_name='config.yaml'):
+        """
+        Upload a configuration to a project.
+
+        Args:
+            project_id (str): The ID of the project.
+            config_data (dict): The configuration, see ``syntheticus_client.base_config``.
+            file_name (str): The file name reported to the server.
+
+        Returns:
+            bool: True if the configuration was uploaded successfully.
+
+        Raises:
+            ValueError: If the configuration is malformed.
+        """
+        validate_config(config_data)
+        url = f"{self.host}/api/projects/{project_id}/update-conf-file/"
+        form = aiohttp.FormData()
+        form.add_field('file', dump_config(config_data), filename=file_name, content_type='text/yaml')
+        status, _ = await self._request('POST', url, data=form)
+        return status == 200
+
+    async def fit(self, project_id, model_id):
+        """
+        Trigger the fit process of a model on a project.
+
+        Args:
+            project_id (str): The ID of the project.
+            model_id (str): The ID of the model.
+
+        Returns:
+            dict: The triggered DAG run.
+        """
+        url = f"{self.host}/api/projects/{project_id}/run-dag/"
+        response = await self._request_json('POST', url, json={"dag_name": f"{model_id}"})
+        return json.loads(''.join(response))
+
+    async def synthetize(self, project_id, model_id):
+        """
+        Trigger the data synthesis process.
+
+        Args:
+            project_id (str): The ID of the project.
+            model_id (str): The ID of the model.
+
+        Returns:
+            dict: The triggered DAG run.
+        """
+        run_id = project_id + '_' + datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        url = f"{self.host_airflow}/api/v1/dags/{model_id}/dagRuns"
+        conf = {"main_data_dir": self.main_data_dir, "project_name": project_id}
+        return await self._request_json('POST', url, airflow=True, json={"dag_run_id": run_id, "conf": conf})
+
+    async def download_data(self, project_id, commit, data_to_download, path, chunk_size=1024 * 1024):
+        """
+        Stream an artifact of a commit to disk.
+
+        Args:
+            project_id (str): The ID of the project.
+            commit (str): The commit ID.
+            data_to_download (str): The type of data to download. Options are 'data_synth', 'models', 'report', 'config', 'metadata'.
+            path (str): The destination file.
+            chunk_size (int): The size of the chunks written to disk.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        url = f"{self.host}/api/projects/{project_id}/download-airflow-data/"
+        body = {"commit": f"{commit}", "data_to_download": f"{data_to_download}"}
+        session = self._get_session()
+        loop = asyncio.get_running_loop()
+        written = 0
+        async with self._semaphore:
+            async with session.post(url, json=body, headers=self._authorized_headers()) as response:
+                if response.status // 100 != 2:
+                    raise RuntimeError(f"Download failed with HTTP {response.status}: {await response.text()}")
+                # disk I/O runs on the default executor so it never blocks the other requests
+                f = await loop.run_in_executor(None, open, path, 'wb')
+                try:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await loop.run_in_executor(None, f.write, chunk)
+                        written += len(chunk)
+                finally:
+                    await loop.run_in_executor(None, f.close)
+        return written
+
+    async def close(self):
+        """
+        Close the underlying HTTP session.
+        """
+        if self._session is not None:
+            await self._session.close()
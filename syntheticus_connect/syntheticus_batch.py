@@ -0,0 +1,107 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+import requests
+from .syntheticus_context import request_context
+from .syntheticus_transport import rate_limiter
+
+
+# batch_job.operation -> the client method triggering the run and the attribute of its host
+OPERATIONS = {'fit': ('_trigger_fit', 'host'), 'synthetize': ('_trigger_synthetize', 'host_airflow')}
+
+
+class batch_job(NamedTuple):
+    """
+    A job: the configuration of a dataset uploaded to a project, then a model trained
+    on it (``operation='fit'``) or synthetic data sampled from it (``'synthetize'``).
+
+    When ``config`` is None the basic configuration of ``dataset_id`` is used, and when
+    both are None the configuration already stored in the project is kept.
+    """
+    project_id: str
+    dataset_id: Optional[str]
+    model_id: str
+    config: Optional[dict] = None
+    operation: str = 'fit'
+
+
+def run_batch(client, jobs, max_concurrency=8, requests_per_second=None, wait=True, timeout=None, monitor=None):
+    """
+    Submit many fit or synthesis jobs and track them through completion.
+
+    Submissions run on a thread pool capped at ``max_concurrency`` and share the
+    client's connection pool and token. An optional per-host rate limit protects
+    the Syntheticus and Airflow servers; it only applies to the submissions of the
+    batch, other calls made on the same client are not throttled. Submitted runs are then followed with one
+    batched run monitor.
+
+    Args:
+        client (syntheticus_client): A logged in client.
+        jobs (iterable): ``batch_job`` instances or (project_id, dataset_id, model_id[, config[, operation]]) tuples.
+        max_concurrency (int): The maximum number of submissions in flight.
+        requests_per_second (float): Optional rate limit of the submission calls to each host.
+        wait (bool): Wait for the submitted runs to reach a terminal state.
+        timeout (float): The maximum number of seconds to wait for the runs.
+        monitor (syntheticus_run_monitor): The monitor used to track the runs, created if not given.
+
+    Returns:
+        list: One dict per job with the keys 'project_id', 'dataset_id', 'model_id', 'operation',
+        'dag_run_id', 'status' ('submitted', 'error' or the final run state),
+        'submit_seconds' and 'error'. The results are returned even if following the runs fails.
+    """
+    jobs = [job if isinstance(job, batch_job) else batch_job(*job) for job in jobs]
+    monitor = monitor or client.run_monitor()
+    # the batch has its own buckets, the shared transport is left untouched
+    limiters = {}
+    if requests_per_second:
+        for host in {urlsplit(client.host).netloc, urlsplit(client.host_airflow).netloc}:
+            limiters[host] = rate_limiter(requests_per_second)
+
+    def throttle(url):
+        limiter = limiters.get(urlsplit(url).netloc)
+        if limiter is not None:
+            limiter.acquire()
+
+    def submit(job):
+        result = {'project_id': job.project_id, 'dataset_id': job.dataset_id, 'model_id': job.model_id,
+                  'operation': job.operation, 'dag_run_id': None, 'status': 'submitted',
+                  'submit_seconds': 0.0, 'error': None}
+        start = time.perf_counter()
+        try:
+            if job.operation not in OPERATIONS:
+                raise ValueError(f"Unknown operation {job.operation!r}, expected one of {', '.join(OPERATIONS)}.")
+            config = job.config
+            if config is None and job.dataset_id is not None:
+                config = client.base_config(job.dataset_id)
+            if config is not None:
+                throttle(client.host)
+                client.upload_config(config, context=request_context(project_id=job.project_id))
+            method, host = OPERATIONS[job.operation]
+            throttle(getattr(client, host))
+            run = getattr(client, method)(job.project_id, job.model_id)
+            monitor.track(run['dag_id'], run['dag_run_id'], run.get('execution_date'))
+            result['dag_run_id'] = run['dag_run_id']
+        except (requests.exceptions.RequestException, ValueError, KeyError) as err:
+            logging.error(f"An error occurred while submitting {job}: {err}")
+            result['status'] = 'error'
+            result['error'] = str(err)
+        result['submit_seconds'] = time.perf_counter() - start
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = list(executor.map(submit, jobs))
+
+    run_ids = [result['dag_run_id'] for result in results if result['dag_run_id']]
+    if wait and run_ids:
+        try:
+            monitor.wait_for_completion(run_ids, timeout)
+        except (TimeoutError, requests.exceptions.RequestException) as err:
+            # every run was submitted, report the states known so far
+            logging.error(f"An error occurred while waiting for the batch: {err}")
+        states = monitor.states(run_ids)
+        for result in results:
+            if result['dag_run_id']:
+                result['status'] = states[result['dag_run_id']] or 'submitted'
+    return results
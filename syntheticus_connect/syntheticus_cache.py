@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+# default time-to-live in seconds of the cacheable catalog endpoints
+DEFAULT_TTLS = {
+    'projects': 60,
+    'datasets': 60,
+    'models': 300,
+    'commits': 30,
+}
+
+
+class syntheticus_response_cache:
+    """
+    An LRU cache of GET responses for the catalog endpoints.
+
+    Fresh entries are served without contacting the server. Once an entry expires
+    it is revalidated with a conditional request (If-None-Match / If-Modified-Since)
+    when the server sent an ETag or Last-Modified header, so an unchanged listing
+    costs a 304 instead of a full body.
+    """
+    def __init__(self, ttls=None, max_entries=256):
+        """
+        Initialize the cache.
+
+        Args:
+            ttls (dict): Time-to-live in seconds per endpoint, merged over DEFAULT_TTLS.
+                Endpoints missing from the mapping are never cached.
+            max_entries (int): The maximum number of responses kept, least recently used first out.
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cacheable(self, endpoint):
+        return endpoint in self.ttls
+
+    def get(self, key):
+        """
+        Get an entry and mark it as recently used.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            dict: The entry, or None if missing.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def fresh(entry):
+        return time.monotonic() < entry['expires_at']
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Build the validation headers of an expired entry.
+
+        Args:
+            entry (dict): The cache entry.
+
+        Returns:
+            dict: The If-None-Match / If-Modified-Since headers.
+        """
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key, endpoint, response):
+        """
+        Store a successful response.
+
+        Args:
+            key (tuple): The cache key.
+            endpoint (str): The endpoint the response belongs to.
+            response (requests.Response): The response, with its body already read.
+        """
+        entry = {
+            'endpoint': endpoint,
+            'response': response,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'expires_at': time.monotonic() + self.ttls[endpoint],
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key):
+        """
+        Extend the lifetime of an entry revalidated by a 304 response.
+
+        Args:
+            key (tuple): The cache key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['expires_at'] = time.monotonic() + self.ttls[entry['endpoint']]
+
+    def invalidate(self, endpoint=None, match=None):
+        """
+        Drop entries.
+
+        Args:
+            endpoint (str): Only drop the entries of this endpoint.
+            match (str): Only drop the entries whose URL contains this string, e.g. a project ID.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                entry = self._entries[key]
+                if endpoint is not None and entry['endpoint'] != endpoint:
+                    continue
+                if match is not None and str(match) not in key[0]:
+                    continue
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,445 @@
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from .syntheticus_records import dataset_record, project_record
+
+
+class _sorted_index:
+    """
+    A secondary index answering range queries on one numeric field with bisect.
+    """
+    def __init__(self):
+        self.values = []
+        self.keys = []
+
+    def add(self, value, key):
+        if value is None:
+            return
+        i = bisect_right(self.values, value)
+        self.values.insert(i, value)
+        self.keys.insert(i, key)
+
+    def remove(self, value, key):
+        if value is None:
+            return
+        i = bisect_left(self.values, value)
+        while i < len(self.values) and self.values[i] == value:
+            if self.keys[i] == key:
+                del self.values[i], self.keys[i]
+                return
+            i += 1
+
+    def range(self, low=None, high=None):
+        start = 0 if low is None else bisect_left(self.values, low)
+        stop = len(self.values) if high is None else bisect_right(self.values, high)
+        return self.keys[start:stop]
+
+    def clear(self):
+        self.values.clear()
+        self.keys.clear()
+
+
+class syntheticus_catalog:
+    """
+    An indexed local copy of the projects and datasets of a Syntheticus server.
+
+    Projects are indexed by ID and name, datasets by (folder ID, dataset name),
+    folder, name and project, so every lookup is a dict access; size and row
+    count have sorted secondary indexes for range queries.
+
+    Syncing walks the listings with conditional requests: every page remembers
+    its ETag / Last-Modified validators and the keys it held, so an unchanged page
+    costs a 304 and leaves the index untouched, and only changed pages are parsed
+    and merged. Entries missing from a complete walk are removed.
+
+    With ``path`` the catalog, validators included, is persisted to SQLite, so a
+    new process starts warm and its first sync only revalidates.
+
+    Example:
+        catalog = client.catalog
+        catalog.sync()
+        catalog.datasets(name='iris')
+        catalog.datasets_by_rows(min_rows=1000000)
+    """
+    def __init__(self, client, path=None):
+        """
+        Initialize the catalog.
+
+        Args:
+            client (syntheticus_client): The client used to reach the server.
+            path (str): Optional SQLite file the catalog is loaded from and saved to.
+                Use one file per host and user.
+        """
+        self.client = client
+        self.path = path
+        self._projects = {} # id -> project_record
+        self._project_names = {} # name -> set of ids
+        self._datasets = {} # (folder id, dataset name) -> dataset_record
+        self._dataset_projects = {} # (folder id, dataset name) -> id of the project listing it
+        self._by_folder = {} # folder id -> set of keys
+        self._by_name = {} # dataset name -> set of keys
+        self._by_project = {} # project id -> set of keys
+        self._by_size = _sorted_index()
+        self._by_rows = _sorted_index()
+        self._pages = {} # page key -> {'validators', 'keys', 'next'}
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self.load()
+
+    # lookups
+
+    def project(self, project_id):
+        """
+        Get a project by ID.
+
+        Returns:
+            project_record: The project, or None if unknown.
+        """
+        return self._projects.get(project_id)
+
+    def projects(self, name=None):
+        """
+        Get the projects, optionally only those with a name.
+
+        Returns:
+            list: The matching project_record.
+        """
+        with self._lock:
+            if name is None:
+                return list(self._projects.values())
+            return [self._projects[project_id] for project_id in self._project_names.get(name, ())]
+
+    def dataset(self, dataset_id, name):
+        """
+        Get a dataset by folder ID and name.
+
+        Returns:
+            dataset_record: The dataset, or None if unknown.
+        """
+        return self._datasets.get((dataset_id, name))
+
+    def datasets(self, project_id=None, dataset_id=None, name=None):
+        """
+        Get the datasets matching every given criterion.
+
+        Args:
+            project_id (str): The ID of the project listing the dataset.
+            dataset_id (str): The ID of the dataset folder.
+            name (str): The name of the dataset.
+
+        Returns:
+            list: The matching dataset_record.
+        """
+        with self._lock:
+            candidates = [index.get(value, set()) for index, value in
+                          ((self._by_project, project_id), (self._by_folder, dataset_id), (self._by_name, name))
+                          if value is not None]
+            if not candidates:
+                return list(self._datasets.values())
+            candidates.sort(key=len)
+            keys = candidates[0].intersection(*candidates[1:])
+            return [self._datasets[key] for key in keys]
+
+    def datasets_by_size(self, min_size=None, max_size=None):
+        """
+        Get the datasets whose size is within bounds, smallest first.
+
+        Args:
+            min_size (int): The inclusive lower bound in bytes, None for no bound.
+            max_size (int): The inclusive upper bound in bytes, None for no bound.
+
+        Returns:
+            list: The matching dataset_record.
+        """
+        with self._lock:
+            return [self._datasets[key] for key in self._by_size.range(min_size, max_size)]
+
+    def datasets_by_rows(self, min_rows=None, max_rows=None):
+        """
+        Get the datasets whose row count is within bounds, smallest first.
+
+        Args:
+            min_rows (int): The inclusive lower bound, None for no bound.
+            max_rows (int): The inclusive upper bound, None for no bound.
+
+        Returns:
+            list: The matching dataset_record.
+        """
+        with self._lock:
+            return [self._datasets[key] for key in self._by_rows.range(min_rows, max_rows)]
+
+    def __len__(self):
+        return len(self._projects) + len(self._datasets)
+
+    # index maintenance
+
+    def _add_project(self, project):
+        current = self._projects.get(project.id)
+        if current == project:
+            return False
+        if current is not None:
+            self._remove_project(project.id, keep_datasets=True)
+        self._projects[project.id] = project
+        self._project_names.setdefault(project.name, set()).add(project.id)
+        return True
+
+    def _remove_project(self, project_id, keep_datasets=False):
+        project = self._projects.pop(project_id, None)
+        if project is not None:
+            ids = self._project_names.get(project.name)
+            ids.discard(project_id)
+            if not ids:
+                del self._project_names[project.name]
+        if not keep_datasets:
+            for key in list(self._by_project.get(project_id, ())):
+                self._remove_dataset(key)
+            self._pages = {page_key: page for page_key, page in self._pages.items() if page_key[0] != project_id}
+
+    def _add_dataset(self, project_id, dataset):
+        key = (dataset.id, dataset.name)
+        if self._datasets.get(key) == dataset and self._dataset_projects.get(key) == project_id:
+            return False
+        self._remove_dataset(key)
+        self._datasets[key] = dataset
+        self._dataset_projects[key] = project_id
+        self._by_folder.setdefault(dataset.id, set()).add(key)
+        self._by_name.setdefault(dataset.name, set()).add(key)
+        self._by_project.setdefault(project_id, set()).add(key)
+        self._by_size.add(dataset.size, key)
+        self._by_rows.add(dataset.rows_number, key)
+        return True
+
+    def _remove_dataset(self, key):
+        dataset = self._datasets.pop(key, None)
+        if dataset is None:
+            return
+        project_id = self._dataset_projects.pop(key)
+        for index, value in ((self._by_folder, dataset.id), (self._by_name, dataset.name),
+                             (self._by_project, project_id)):
+            keys = index[value]
+            keys.discard(key)
+            if not keys:
+                del index[value]
+        self._by_size.remove(dataset.size, key)
+        self._by_rows.remove(dataset.rows_number, key)
+
+    def forget_project(self, project_id):
+        """
+        Drop a project and its datasets, e.g. after deleting it.
+
+        Args:
+            project_id (str): The ID of the project.
+        """
+        with self._lock:
+            self._remove_project(project_id)
+            self._pages = {page_key: page for page_key, page in self._pages.items() if page_key[0] != 'projects'}
+        self._autosave()
+
+    def clear(self):
+        with self._lock:
+            for index in (self._projects, self._project_names, self._datasets, self._dataset_projects,
+                          self._by_folder, self._by_name, self._by_project, self._pages):
+                index.clear()
+            self._by_size.clear()
+            self._by_rows.clear()
+
+    # sync
+
+    def _walk(self, scope, url, params, parse, key, add):
+        """
+        Walk a paginated listing, merging only the pages that changed.
+
+        Args:
+            scope (str): 'projects' or the ID of the project whose datasets are listed.
+            url (str): The URL of the first page.
+            params (dict): The query parameters of the first page.
+            parse (callable): Turns a listed item into a list of records.
+            key (callable): The index key of a record.
+            add (callable): Adds a record to the index, returns True if it changed.
+
+        Returns:
+            tuple: The records in server order and the number of changed entries.
+        """
+        records, changes = [], 0
+        endpoint = 'projects' if scope == 'projects' else 'datasets'
+        transport = self.client.transport
+        # with the response cache on, the transport revalidates and keeps the pages itself:
+        # sending the catalog's validators would answer 304s the cache cannot store
+        own_validators = transport.cache is None or not transport.cache.cacheable(endpoint)
+        spec = (url, params)
+        while spec is not None:
+            page_url, page_params = spec
+            page_key = (scope, page_url, json.dumps(page_params, sort_keys=True))
+            with self._lock:
+                page = self._pages.get(page_key)
+            if page:
+                response = transport.get(page_url, params=page_params,
+                                         headers=page['validators'] if own_validators else None, endpoint=endpoint)
+                etag = response.headers.get('ETag')
+                if response.status_code == 304 or (etag and etag == page['validators'].get('If-None-Match')):
+                    # unchanged page, its entries are still valid unless the index lost some of them
+                    with self._lock:
+                        page_records = [record for record in map(self._lookup(scope), page['keys']) if record is not None]
+                    if len(page_records) == len(page['keys']):
+                        records += page_records
+                        spec = page['next']
+                        continue
+                    response = transport.get(page_url, params=page_params)
+            else:
+                response = transport.get(page_url, params=page_params, endpoint=endpoint)
+            response.raise_for_status()
+            data = response.json()
+            page_records = [record for item in data.get('results', []) for record in parse(item)]
+            with self._lock:
+                changes += sum(add(record) for record in page_records)
+            next_url = data.get('next')
+            spec = (next_url, None) if next_url else None
+            validators = {}
+            if response.headers.get('ETag'):
+                validators['If-None-Match'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                validators['If-Modified-Since'] = response.headers['Last-Modified']
+            with self._lock:
+                self._pages[page_key] = {'validators': validators, 'keys': [key(record) for record in page_records],
+                                         'next': spec}
+            records += page_records
+        return records, changes
+
+    def _lookup(self, scope):
+        if scope == 'projects':
+            return self._projects.get
+        return self._datasets.get
+
+    def sync_projects(self, page_size=100):
+        """
+        Bring the projects up to date.
+
+        Returns:
+            list: Every project_record, in server order.
+        """
+        records, changes = self._walk('projects', f"{self.client.host}/api/projects/", {'page_size': page_size},
+                                      lambda item: [project_record.from_json(item)], lambda record: record.id,
+                                      self._add_project)
+        with self._lock:
+            seen = {record.id for record in records}
+            for project_id in [project_id for project_id in self._projects if project_id not in seen]:
+                self._remove_project(project_id)
+                changes += 1
+        self._autosave(changes)
+        return records
+
+    def sync_datasets(self, project_id, page_size=100):
+        """
+        Bring the datasets of a project up to date.
+
+        Args:
+            project_id (str): The ID of the project.
+
+        Returns:
+            list: Every dataset_record of the project, in server order.
+        """
+        url = f"{self.client.host}/api/projects/{project_id}/list-dataset-folders/"
+        records, changes = self._walk(project_id, url, {'page_size': page_size}, dataset_record.from_folder,
+                                      lambda record: (record.id, record.name),
+                                      lambda record: self._add_dataset(project_id, record))
+        with self._lock:
+            seen = {(record.id, record.name) for record in records}
+            for key in [key for key in self._by_project.get(project_id, ()) if key not in seen]:
+                self._remove_dataset(key)
+                changes += 1
+        self._autosave(changes)
+        return records
+
+    def sync(self, page_size=100):
+        """
+        Bring the projects and the datasets of every project up to date.
+
+        Returns:
+            syntheticus_catalog: The catalog itself.
+        """
+        for project in self.sync_projects(page_size):
+            self.sync_datasets(project.id, page_size)
+        return self
+
+    # persistence
+
+    def _autosave(self, changes=1):
+        if self.path and changes:
+            self.save()
+
+    def save(self, path=None):
+        """
+        Write the catalog to SQLite.
+
+        Args:
+            path (str): The file, defaults to the path given at initialization.
+        """
+        import sqlite3
+        path = path or self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            projects = list(self._projects.values())
+            datasets = [(self._dataset_projects[key],) + tuple(dataset) for key, dataset in self._datasets.items()]
+            pages = [(json.dumps(page_key), json.dumps(page['validators']), json.dumps(page['keys']),
+                      json.dumps(page['next'])) for page_key, page in self._pages.items()]
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                connection.executescript(_SCHEMA)
+                connection.execute("DELETE FROM meta")
+                connection.execute("DELETE FROM projects")
+                connection.execute("DELETE FROM datasets")
+                connection.execute("DELETE FROM pages")
+                connection.execute("INSERT INTO meta VALUES ('host', ?)", (self.client.host,))
+                connection.executemany("INSERT INTO projects VALUES (?, ?, ?)", projects)
+                connection.executemany("INSERT INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", datasets)
+                connection.executemany("INSERT INTO pages VALUES (?, ?, ?, ?)", pages)
+        finally:
+            connection.close()
+
+    def load(self, path=None):
+        """
+        Replace the catalog with the content of a SQLite file written by ``save``.
+
+        A file written for another host is ignored.
+
+        Args:
+            path (str): The file, defaults to the path given at initialization.
+        """
+        import sqlite3
+        connection = sqlite3.connect(path or self.path)
+        try:
+            connection.executescript(_SCHEMA)
+            host = connection.execute("SELECT value FROM meta WHERE key = 'host'").fetchone()
+            if host is None or host[0] != self.client.host:
+                return
+            projects = connection.execute("SELECT * FROM projects").fetchall()
+            datasets = connection.execute("SELECT * FROM datasets").fetchall()
+            pages = connection.execute("SELECT * FROM pages").fetchall()
+        finally:
+            connection.close()
+        with self._lock:
+            self.clear()
+            for row in projects:
+                self._add_project(project_record(*row))
+            for row in datasets:
+                self._add_dataset(row[0], dataset_record(*row[1:]))
+            for page_key, validators, keys, next_spec in pages:
+                next_spec = json.loads(next_spec)
+                self._pages[tuple(json.loads(page_key))] = {
+                    'validators': json.loads(validators),
+                    'keys': [tuple(key) if isinstance(key, list) else key for key in json.loads(keys)],
+                    'next': tuple(next_spec) if next_spec else None,
+                }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS projects (id TEXT PRIMARY KEY, name TEXT, created_at TEXT);
+CREATE TABLE IF NOT EXISTS datasets (
+    project TEXT, id TEXT, name TEXT, project_id TEXT, data_type TEXT,
+    size INTEGER, rows_number INTEGER, n_columns INTEGER, PRIMARY KEY (id, name)
+);
+CREATE TABLE IF NOT EXISTS pages (key TEXT PRIMARY KEY, validators TEXT, keys TEXT, next TEXT);
+"""
@@ -0,0 +1,434 @@
+"""
+Run Syntheticus pipelines described in a YAML or JSON manifest.
+
+Every job goes through the stages upload -> conf -> fit -> wait -> download.
+Each stage has its own worker pool, so independent jobs are pipelined: the
+upload of one job overlaps the training of another. Progress is written to
+stdout as JSON lines, the human-readable messages of the client go to stderr.
+
+Manifest:
+    host: https://syntheticus.example.com
+    username: alice
+    password_env: SYNTHETICUS_PASSWORD   # or password: ...
+    token_cache: true
+    parallelism: {upload: 2, conf: 4, fit: 4, download: 2}
+    defaults: {model: ctgan, download: [data_synth, report], output_format: parquet}
+    jobs:
+      - name: iris
+        project: my_project              # project ID or name
+        dataset: iris                    # dataset folder name
+        folder: ./dataset
+        files: [iris.csv, metadata.json]
+        config: iris.yaml                # optional, the basic configuration otherwise
+        commit: 3f2a...                  # optional, the commit to download from
+
+Without a commit, the artifacts are downloaded from the commit of the job's run.
+The commit log does not tell which run made a commit, so the jobs of one project
+that need it go through fit -> wait -> download one at a time and the newest
+commit is theirs; jobs of different projects are still pipelined.
+
+Usage:
+    syntheticus manifest.yaml
+    syntheticus manifest.yaml --parallelism upload=4 --timeout 7200
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from .syntheticus_runs import TERMINAL_STATES
+
+STAGES = ('upload', 'conf', 'fit', 'wait', 'download')
+
+DEFAULT_PARALLELISM = {'upload': 2, 'conf': 4, 'fit': 4, 'download': 2}
+
+
+def load_manifest(path):
+    """
+    Read a manifest.
+
+    Args:
+        path (str): A .json file, or a YAML file otherwise.
+
+    Returns:
+        dict: The manifest.
+    """
+    with open(path) as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        from ruamel.yaml import YAML
+        return YAML(typ='safe').load(f)
+
+
+def _load_config(path):
+    # a configuration file given in the manifest, YAML or JSON
+    return load_manifest(path)
+
+
+class manifest_runner:
+    """
+    Drive the jobs of a manifest through the pipeline stages.
+
+    The upload, conf, fit and download stages run on their own thread pools over
+    one shared, logged in client; every job carries its selection in a
+    request_context. The wait stage is a single poller following every
+    submitted run with one batched request per interval. Jobs that find their
+    commit in the commit log hold their project from fit to download, see
+    ``_needs_project``.
+    """
+    def __init__(self, client, jobs, parallelism=None, defaults=None, timeout=None, emit=None):
+        """
+        Initialize the runner.
+
+        Args:
+            client (syntheticus_client): A logged in client.
+            jobs (list): The job dicts of the manifest.
+            parallelism (dict): The number of workers of each stage, merged over DEFAULT_PARALLELISM.
+            defaults (dict): Values used for the keys missing from a job.
+            timeout (float): The maximum number of seconds a run may take to complete.
+            emit (callable): Called with every progress event (a dict).
+        """
+        self.client = client
+        self.parallelism = {**DEFAULT_PARALLELISM, **(parallelism or {})}
+        self.timeout = timeout
+        self.emit = emit or (lambda event: None)
+        self.jobs = []
+        for index, job in enumerate(jobs):
+            job = {**(defaults or {}), **job}
+            job.setdefault('name', job.get('dataset') or f'job{index}')
+            self.jobs.append({'spec': job, 'name': job['name'], 'status': 'pending', 'stage': None,
+                              'error': None, 'context': None, 'run': None, 'commit': None, 'artifacts': []})
+        self.monitor = client.run_monitor()
+        self._waiting = {} # dag_run_id -> (job, deadline)
+        self._projects = {} # project id -> deque of (job, stage) waiting for the project, present while held
+        self._condition = threading.Condition()
+        self._remaining = len(self.jobs)
+        self._done = threading.Event()
+
+    def _event(self, job, stage, event, **fields):
+        self.emit({'time': round(time.time(), 3), 'job': job['name'], 'stage': stage, 'event': event, **fields})
+
+    # stages
+
+    def _stages(self, job):
+        spec = job['spec']
+        stages = []
+        if spec.get('files'):
+            stages.append('upload')
+        if spec.get('fit', True):
+            stages += ['conf', 'fit', 'wait']
+        if spec.get('download'):
+            stages.append('download')
+        return stages
+
+    def _resolve(self, job):
+        from .syntheticus_context import request_context
+        spec = job['spec']
+        catalog = self.client.catalog
+        project = catalog.project(spec['project'])
+        if project is None:
+            matches = catalog.projects(name=spec['project'])
+            if len(matches) != 1:
+                raise ValueError(f"Project {spec['project']} not found or ambiguous.")
+            project = matches[0]
+        context = request_context().with_project(project).with_model(spec.get('model'))
+        if spec.get('dataset_id') or spec.get('dataset'):
+            context = context.with_dataset(spec.get('dataset_id'), spec.get('dataset'))
+        if spec.get('commit'):
+            context = context.with_commit(spec['commit'])
+        return context
+
+    def _dataset_folder_id(self, context):
+        for folder in self.client.iter_datasets(context.project_id):
+            if any(dataset.get('dataset_name') == context.dataset_name for dataset in folder.get('datasets', [])):
+                return folder.get('id')
+        raise ValueError(f"Dataset folder {context.dataset_name} not found in project {context.project_id}.")
+
+    def _upload(self, job):
+        spec, context = job['spec'], job['context']
+        ok = self.client.upload_data(spec['dataset'], spec.get('folder', '.'), spec['files'], stream=True,
+                                     skip_unchanged=spec.get('skip_unchanged', False),
+                                     compression=spec.get('compression'), context=context)
+        if not ok:
+            raise RuntimeError(f"Upload of {spec['dataset']} failed.")
+
+    def _conf(self, job):
+        spec, context = job['spec'], job['context']
+        if spec.get('config'):
+            config = _load_config(spec['config'])
+        else:
+            dataset_id = context.dataset_id or self._dataset_folder_id(context)
+            job['context'] = context = context.with_dataset(dataset_id, context.dataset_name)
+            config = self.client.base_config(dataset_id)
+        return {'config': self.client.upload_config(config, context=context)}
+
+    def _fit(self, job):
+        if not job['context'].model_id:
+            raise ValueError("No model given for the job.")
+        job['run'] = self.client._trigger_fit(job['context'].project_id, job['context'].model_id)
+        return {'dag_id': job['run']['dag_id'], 'dag_run_id': job['run']['dag_run_id']}
+
+    def _download(self, job):
+        from .syntheticus_convert import convert_archive
+        spec, context = job['spec'], job['context']
+        commit = context.commit
+        if commit is None:
+            commits = self.client.list_commits(show=False, context=context)
+            if not commits:
+                raise RuntimeError(f"No commit found in project {context.project_id}.")
+            commit = self._job_commit(job, commits)
+        job['commit'] = commit
+        artifacts = spec['download'] if isinstance(spec['download'], list) else [spec['download']]
+        output_dir = spec.get('output_dir', 'downloads')
+        results = self.client.download_many([(commit, artifact) for artifact in artifacts], output_dir,
+                                            max_workers=len(artifacts), context=context)
+        failed = [result for result in results if result['status'] != 'ok']
+        if failed:
+            raise RuntimeError('; '.join(f"{result['data_to_download']}: {result['error']}" for result in failed))
+        for result in results:
+            paths = [result['path']]
+            if result['data_to_download'] in ('data_synth', 'data_real') and spec.get('output_format'):
+                base_name = os.path.splitext(result['path'])[0]
+                paths = convert_archive(result['path'], base_name, spec['output_format'], max_workers=1)
+            job['artifacts'] += paths
+        return {'commit': commit, 'paths': job['artifacts']}
+
+    @staticmethod
+    def _job_commit(job, commits):
+        # a commit mentioning the run is the job's, otherwise the newest one: the job holds
+        # its project from fit to download, so no other job of the manifest committed since
+        if job['run']:
+            run_id = job['run']['dag_run_id']
+            for commit in commits:
+                fields = [commit.subject or ''] + [str(value) for value in (commit.extra or {}).values()]
+                if any(run_id in field for field in fields):
+                    return commit.id
+        # commit-logs lists the newest experiment first
+        return commits[0].id
+
+    # scheduling
+
+    def _needs_project(self, job, stage):
+        # without an explicit commit, the download takes the newest commit of the project
+        return (stage in ('fit', 'download') and job['context'].commit is None
+                and 'download' in self._stages(job) and not job.get('holds_project'))
+
+    def _hold_project(self, job, stage):
+        """
+        Take the project of a job before it runs ``stage``, or queue the job behind the holder.
+
+        Returns:
+            bool: True if the job can run the stage now.
+        """
+        project_id = job['context'].project_id
+        with self._condition:
+            queue = self._projects.get(project_id)
+            if queue is not None:
+                queue.append((job, stage))
+                queued = len(queue)
+            else:
+                self._projects[project_id] = deque()
+                job['holds_project'] = True
+                return True
+        self._event(job, stage, 'queued', project_id=project_id, position=queued)
+        return False
+
+    def _release_project(self, job):
+        if not job.pop('holds_project', False):
+            return
+        project_id = job['context'].project_id
+        with self._condition:
+            queue = self._projects[project_id]
+            if not queue:
+                del self._projects[project_id]
+                return
+            next_job, stage = queue.popleft()
+            next_job['holds_project'] = True
+        self._executors[stage].submit(self._run_stage, next_job, stage)
+
+    def _advance(self, job, stage=None):
+        stages = self._stages(job)
+        position = 0 if stage is None else stages.index(stage) + 1
+        if position == len(stages):
+            job['status'] = 'ok'
+            self._event(job, None, 'finished')
+            self._release_project(job)
+            self._finish()
+            return
+        next_stage = stages[position]
+        job['stage'] = next_stage
+        if self._needs_project(job, next_stage) and not self._hold_project(job, next_stage):
+            return
+        if next_stage == 'wait':
+            run = job['run']
+            self.monitor.track(run['dag_id'], run['dag_run_id'], run.get('execution_date'))
+            deadline = None if self.timeout is None else time.monotonic() + self.timeout
+            self._event(job, 'wait', 'start', dag_run_id=run['dag_run_id'])
+            with self._condition:
+                self._waiting[run['dag_run_id']] = (job, deadline)
+                self._condition.notify()
+        else:
+            self._executors[next_stage].submit(self._run_stage, job, next_stage)
+
+    def _run_stage(self, job, stage):
+        self._event(job, stage, 'start')
+        start = time.perf_counter()
+        try:
+            result = getattr(self, f'_{stage}')(job) or {}
+        except Exception as err:
+            self._fail(job, stage, err)
+            return
+        self._event(job, stage, 'done', seconds=round(time.perf_counter() - start, 3), **result)
+        self._advance(job, stage)
+
+    def _fail(self, job, stage, err):
+        job['status'] = 'error'
+        job['error'] = str(err)
+        self._event(job, stage, 'error', error=str(err))
+        self._release_project(job)
+        self._finish()
+
+    def _finish(self):
+        with self._condition:
+            self._remaining -= 1
+            if self._remaining == 0:
+                self._done.set()
+                self._condition.notify()
+
+    def _poll_runs(self):
+        interval = self.monitor.min_interval
+        while not self._done.is_set():
+            with self._condition:
+                while not self._waiting and not self._done.is_set():
+                    self._condition.wait()
+                    interval = self.monitor.min_interval
+                if self._done.is_set():
+                    return
+            try:
+                changed = self.monitor.poll()
+            except Exception as err:
+                # a failed poll is retried at the next interval
+                changed = False
+                self.emit({'time': round(time.time(), 3), 'job': None, 'stage': 'wait', 'event': 'poll_error',
+                           'error': str(err)})
+            with self._condition:
+                waiting = dict(self._waiting)
+            states = self.monitor.states(list(waiting))
+            now = time.monotonic()
+            for run_id, (job, deadline) in waiting.items():
+                state = states[run_id]
+                if state not in TERMINAL_STATES and (deadline is None or now <= deadline):
+                    continue
+                with self._condition:
+                    del self._waiting[run_id]
+                if state == 'success':
+                    self._event(job, 'wait', 'done', state=state)
+                    self._advance(job, 'wait')
+                elif state in TERMINAL_STATES:
+                    self._fail(job, 'wait', RuntimeError(f"Run {run_id} ended in state {state}."))
+                else:
+                    self._fail(job, 'wait', TimeoutError(f"Run {run_id} still {state} after {self.timeout}s."))
+            interval = self.monitor.min_interval if changed else min(interval * self.monitor.backoff,
+                                                                    self.monitor.max_interval)
+            self._done.wait(interval)
+
+    def run(self):
+        """
+        Run every job to completion.
+
+        Returns:
+            list: One summary dict per job with the keys 'name', 'status' ('ok' or 'error'),
+            'stage' (the last stage reached), 'error', 'dag_run_id', 'commit' and 'artifacts'.
+        """
+        if not self.jobs:
+            return []
+        self.client.get_projects(show=False)
+        self._executors = {stage: ThreadPoolExecutor(max_workers=self.parallelism[stage], thread_name_prefix=stage)
+                           for stage in STAGES if stage != 'wait'}
+        poller = threading.Thread(target=self._poll_runs, name='wait', daemon=True)
+        poller.start()
+        try:
+            for job in self.jobs:
+                try:
+                    job['context'] = self._resolve(job)
+                except (ValueError, KeyError) as err:
+                    self._fail(job, None, err)
+                    continue
+                self._advance(job)
+            self._done.wait()
+        finally:
+            for executor in self._executors.values():
+                executor.shutdown(wait=True)
+            self._done.set()
+            with self._condition:
+                self._condition.notify()
+            poller.join()
+        return [{'name': job['name'], 'status': job['status'], 'stage': job['stage'], 'error': job['error'],
+                 'dag_run_id': job['run']['dag_run_id'] if job['run'] else None, 'commit': job['commit'],
+                 'artifacts': job['artifacts']} for job in self.jobs]
+
+
+def _parallelism(values):
+    parallelism = {}
+    for value in values or ():
+        stage, _, workers = value.partition('=')
+        if stage not in DEFAULT_PARALLELISM or not workers.isdigit() or int(workers) < 1:
+            raise argparse.ArgumentTypeError(f"Invalid --parallelism {value}, expected one of "
+                                             f"{', '.join(DEFAULT_PARALLELISM)}=N.")
+        parallelism[stage] = int(workers)
+    return parallelism
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='syntheticus', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('manifest', help='the YAML or JSON manifest')
+    parser.add_argument('--parallelism', action='append', metavar='STAGE=N',
+                        help='workers of a stage (upload, conf, fit, download), can be repeated')
+    parser.add_argument('--timeout', type=float, help='maximum number of seconds a run may take')
+    parser.add_argument('--host', help='overrides the host of the manifest')
+    args = parser.parse_args(argv)
+    try:
+        parallelism = _parallelism(args.parallelism)
+    except argparse.ArgumentTypeError as err:
+        parser.error(str(err))
+
+    manifest = load_manifest(args.manifest)
+    # the flags override the manifest, every stage worker may hold a pooled connection
+    parallelism = {**DEFAULT_PARALLELISM, **manifest.get('parallelism', {}), **parallelism}
+    events = sys.stdout
+    lock = threading.Lock()
+
+    def emit(event):
+        with lock:
+            events.write(json.dumps(event) + '\n')
+            events.flush()
+
+    from .syntheticus_client import syntheticus_client
+    # the client prints for humans, keep stdout for the JSON lines
+    with redirect_stdout(sys.stderr):
+        client = syntheticus_client(args.host or manifest['host'], pool_maxsize=max(10, sum(parallelism.values())),
+                                    token_cache=manifest.get('token_cache', False))
+        password = manifest.get('password')
+        if password is None:
+            password = os.environ.get(manifest.get('password_env', 'SYNTHETICUS_PASSWORD'))
+        message = client.login(manifest['username'], password)
+        emit({'time': round(time.time(), 3), 'job': None, 'stage': 'login', 'event': 'done', 'message': message})
+        if message != "Login successful.":
+            return 2
+        runner = manifest_runner(client, manifest.get('jobs', []), parallelism,
+                                 manifest.get('defaults'), args.timeout or manifest.get('timeout'), emit)
+        try:
+            results = runner.run()
+        finally:
+            client.close()
+    emit({'time': round(time.time(), 3), 'job': None, 'stage': None, 'event': 'summary', 'jobs': results})
+    return 0 if all(result['status'] == 'ok' for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,50 +3,56 @@ import json
 import logging
 import os
 from datetime import datetime
-from tabulate import tabulate
-import os
-from IPython.core.getipython import get_ipython
-import yaml
-from ruamel.yaml import YAML
-import os
 import textwrap
-import pandas as pd
-import zipfile
-import io
+import mimetypes
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from tempfile import TemporaryDirectory
+from .syntheticus_transport import syntheticus_transport
+from .syntheticus_cache import syntheticus_response_cache
+from .syntheticus_pagination import paginate
+from .syntheticus_runs import syntheticus_run_monitor
+from .syntheticus_batch import run_batch
+from .syntheticus_manifest import upload_manifest
+from .syntheticus_csv import read_header, row_aligned_ranges
+from .syntheticus_metrics import DEFAULT_BUCKETS, syntheticus_metrics
+from .syntheticus_upload import COMPRESSION_CODECS, compress_files, multipart_encoder, print_progress, resolve_codec
+from .syntheticus_convert import OUTPUT_FORMATS, convert_archive
+from .syntheticus_catalog import syntheticus_catalog
+from .syntheticus_context import request_context
+from .syntheticus_config import config_digest, dump_config, load_config, validate_config
+from .syntheticus_tokens import token_store
+from .syntheticus_records import commit_record, model_record, print_records, project_record, user_record
 
 class syntheticus_client:
     """
     A class for interacting with the Syntheticus API.
     """
-    def _authorized_headers(self):
-        """
-        Get the authorized headers including the authentication token.
-
-        Returns:
-            dict: The headers dictionary.
-        """
-        return {
-            'Authorization': f'Token {self.token}',
-            'Content-Type': 'application/json'
-                }
-
-    def __init__(self, host):
+    def __init__(self, host, pool_maxsize=10, timeout=(5, 60), max_retries=0, catalog_path=None, token_cache=None):
         """
         Initialize the SyntheticusConnect instance.
 
         Args:
             host (str): The base URL of the API.
+            pool_maxsize (int): The maximum number of kept-alive connections per host.
+            timeout (float or tuple): Default (connect, read) timeout in seconds.
+            max_retries (int): Number of retries for failed connections.
+            catalog_path (str): Optional SQLite file persisting the project and dataset catalog.
+            token_cache (bool, str or token_store): Reuse login tokens across processes: True for
+                the default store in ~/.syntheticus, a file path, or a token_store instance.
         """
 
         self.host = host # + ':8000' # host syntheticus nav
         self.host_airflow = host # + ':8080' # host airflow
-        self.token = None # user token assigned at login
+        self.transport = syntheticus_transport(pool_maxsize=pool_maxsize, timeout=timeout,
+                                               max_retries=max_retries)
         self.user = None # username
         self.password = None # passwod
         self.projects = {} # dictionary with the list of projects
-        self.datasets = {} # dictionary with the list of datasets for a project
-        self.session = requests.Session()
-        self.session.auth = ('airflow', 'airflow') # airflow credentials will be deprecated
+        self.datasets = {} # datasets of the selected project by (folder id, dataset name)
+        self.session = self.transport.session # pooled session shared by every call
         self.main_data_dir = './media/' # directory in syntheticus nav
         self.project_id = None # selected project id
         self.project_name = None # selected project name
@@ -55,6 +61,57 @@ class syntheticus_client:
         self.dataset_name = None # selected dataset name
         self.config_file_path = None # path to the config file
         self.commit = None # commit id
+        self.projects_data = [] # project_record list of the last get_projects
+        self.datasets_data = [] # dataset_record list of the last get_datasets
+        self.models = [] # model_record list of the last get_models
+        self.commits = [] # commit_record list of the last list_commits
+        self._local = threading.local() # per-thread state of a client shared by worker threads
+        self._lock = threading.Lock() # guards the lazily created shared state
+        self.last_run = None # dag_id, dag_run_id and execution_date of the last triggered run
+        self._upload_manifest = None # local manifest of uploaded file hashes
+        self._config_digests = {} # project id -> hash of the last configuration uploaded by this client
+        self.catalog = syntheticus_catalog(self, catalog_path) # indexed projects and datasets
+        if token_cache is True:
+            token_cache = token_store()
+        elif isinstance(token_cache, str):
+            token_cache = token_store(token_cache)
+        self.token_cache = token_cache or None # optional on-disk token store
+        self.transport.reauthenticate = self._reauthenticate
+
+    @property
+    def token(self):
+        """
+        The user token assigned at login, held by the shared transport.
+        """
+        return self.transport.token
+
+    @token.setter
+    def token(self, value):
+        self.transport.token = value
+
+    @property
+    def last_run(self):
+        """
+        The dag_id, dag_run_id and execution_date of the last run triggered by the calling thread.
+        """
+        return getattr(self._local, 'last_run', None)
+
+    @last_run.setter
+    def last_run(self, value):
+        self._local.last_run = value
+
+    def current_context(self):
+        """
+        Snapshot the selection made with the select_* methods.
+
+        Returns:
+            request_context: The selected project, dataset, model, commit and configuration file.
+        """
+        return request_context(self.project_id, self.project_name, self.dataset_id, self.dataset_name,
+                               self.model_id, self.commit, self.config_file_path)
+
+    def _context(self, context):
+        return self.current_context() if context is None else context
         
     # def register(self, username, email, password):
     #     """
@@ -106,13 +163,18 @@ class syntheticus_client:
 
 
 
-    def login(self, username, password):
+    def login(self, username, password, use_cache=True):
         """
         Log in to the API.
 
+        With a token cache, a valid token stored by a previous login of the same user
+        on the same host is reused without contacting the server. Should the server
+        reject it, the next request logs in again once and is replayed.
+
         Args:
             username (str): The username for authentication.
             password (str): The password for authentication.
+            use_cache (bool): Reuse a stored token when a token cache is configured.
 
         Returns:
             str: The login status message.
@@ -121,18 +183,39 @@ class syntheticus_client:
         # reinitailzias variables
         self.user = username
         self.password = password
+        if use_cache and self.token_cache is not None:
+            token = self.token_cache.get(self.host, username)
+            if token:
+                self.token = token
+                return "Login successful."
         url = f"{self.host}/dj-rest-auth/login/"
         body = {
             "username": username,
             "password": password
         }
-        response = requests.post(url, data=json.dumps(body), headers={'Content-Type': 'application/json'})
+        response = self.transport.post(url, auth=None, data=json.dumps(body), headers={'Content-Type': 'application/json'})
         if response.status_code == 200:
             self.token = response.json().get('key')  
+            if self.token_cache is not None and self.token:
+                self.token_cache.put(self.host, username, self.token)
             return "Login successful."
         else:
             return f"Login failed. Status code: {response.status_code}"
 
+    def _reauthenticate(self):
+        """
+        Log in again after the server rejected the token.
+
+        Returns:
+            bool: True if a new token was obtained.
+        """
+        if not self.user or self.password is None:
+            return False
+        if self.token_cache is not None:
+            self.token_cache.discard(self.host, self.user)
+        logging.info(f"Token rejected by {self.host}, logging in again as {self.user}.")
+        return self.login(self.user, self.password, use_cache=False) == "Login successful."
+
     def logout(self):
         """
         Log out from the API.
@@ -141,9 +224,64 @@ class syntheticus_client:
             str: The response text from the logout request.
         """
         url = f"{self.host}/dj-rest-auth/logout/"
-        response = requests.post(url, headers=self._authorized_headers())
+        response = self.transport.post(url)
+        if self.token_cache is not None and self.user:
+            self.token_cache.discard(self.host, self.user)
         return response.text
 
+    def close(self):
+        """
+        Close the pooled connections held by the client.
+        """
+        self.transport.close()
+
+    def enable_cache(self, ttls=None, max_entries=256):
+        """
+        Cache the responses of the catalog endpoints (projects, datasets, models, commits).
+
+        Entries are revalidated with ETag/Last-Modified once their TTL expires and are
+        invalidated automatically by create_project, delete_project, upload_data, fit
+        and synthetize.
+
+        Args:
+            ttls (dict): Time-to-live in seconds per endpoint, e.g. {'models': 600}.
+            max_entries (int): The maximum number of cached responses.
+        """
+        self.transport.cache = syntheticus_response_cache(ttls=ttls, max_entries=max_entries)
+
+    @property
+    def metrics(self):
+        """
+        The syntheticus_metrics recording the calls of the client, None when disabled.
+        """
+        return self.transport.metrics
+
+    def enable_metrics(self, buckets=DEFAULT_BUCKETS):
+        """
+        Record method, endpoint template, status, latency, bytes and retries of every
+        HTTP call, and the download/decoding/writing phases of download_data.
+
+        Use ``client.metrics.snapshot()`` or ``client.metrics.to_prometheus()`` to read
+        them. When disabled, calls skip the instrumentation entirely.
+
+        Args:
+            buckets (tuple): Upper bounds in seconds of the latency histogram buckets.
+
+        Returns:
+            syntheticus_metrics: The metrics.
+        """
+        self.transport.metrics = syntheticus_metrics(buckets)
+        return self.transport.metrics
+
+    def disable_metrics(self):
+        self.transport.metrics = None
+
+    def disable_cache(self):
+        """
+        Stop caching catalog responses and drop the cached ones.
+        """
+        self.transport.cache = None
+
     def change_password(self, new_password):
         """
         Change the user's password.
@@ -159,7 +297,7 @@ class syntheticus_client:
             "new_password1": new_password,
             "new_password2": new_password
         }
-        response = requests.post(url, data=json.dumps(body), headers=self._authorized_headers())
+        response = self.transport.post(url, data=json.dumps(body), headers={'Content-Type': 'application/json'})
         return response.json()
 
     def get_user(self, user_id):
@@ -173,99 +311,180 @@ class syntheticus_client:
             str: The response text containing the user details.
         """
         url = f"{self.host}/api/users/{user_id}/"
-        response = requests.get(url, headers=self._authorized_headers())
+        response = self.transport.get(url)
         return response.text
 
-    def get_me(self):
+    def get_me(self, show=True):
         """
         Get the current user's details.
 
+        Args:
+            show (bool): Print the details.
+
         Returns:
-            None
+            user_record: The user, or None if the request failed.
         """
         url = f"{self.host}/api/users/me/"
-        response = requests.get(url, headers=self._authorized_headers())
-        if response.status_code == 200:
-            user_data = response.json()
-            username = user_data.get('username')
-            name = user_data.get('name')
-            user_url = user_data.get('url')
-
+        response = self.transport.get(url)
+        if response.status_code != 200:
+            print("Error fetching user details.")
+            return None
+        user = user_record.from_json(response.json())
+        if show:
             print("User details:")
-            print(f"Username: {username}")
-            print(f"Name: {name}")
-            print(f"URL: {user_url}")
+            print(f"Username: {user.username}")
+            print(f"Name: {user.name}")
+            print(f"URL: {user.url}")
             print("-" * 20)
-        else:
-            print("Error fetching user details.")
+        return user
 
-    def create_project(self, name):
+    def create_project(self, name, show=True):
         """
         Create a new project.
 
         Args:
             name (str): The name of the project.
+            show (bool): Print the created project.
 
         Returns:
-            dict: The response JSON containing the project details.
+            project_record: The created project, or None if the request failed.
         """
         url = f"{self.host}/api/projects/"
         body = {
             "name": name
         }
-        response = requests.post(url, data=json.dumps(body), headers=self._authorized_headers())
-        if response.status_code == 201:
-            project_data = response.json()
-            project_id = project_data.get('id')
-            project_name = project_data.get('name')
-            created_at = project_data.get('created_at')
-
+        response = self.transport.post(url, data=json.dumps(body), headers={'Content-Type': 'application/json'})
+        if response.status_code != 201:
+            print('Error creating the project.')
+            return None
+        self.transport.invalidate('projects')
+        project = project_record.from_json(response.json())
+        if show:
             print("Project created:")
-            print(f"ID: {project_id}")
-            print(f"Name: {project_name}")
-            print(f"Created at: {created_at}")
+            print(f"ID: {project.id}")
+            print(f"Name: {project.name}")
+            print(f"Created at: {project.created_at}")
             print("-" * 20)
 
-            self.projects[project_id] = project_name
-            self.project_id = project_id    
-        else:
-            print('Error creating the project.')
+        self.projects[project.id] = project.name
+        self.project_id = project.id
+        return project
+
+    def _fetch_page(self, endpoint, results_key='results', auth='token'):
+        """
+        Build a page fetcher for a paginated Django REST listing.
+
+        Args:
+            endpoint (str): The name of the endpoint, used by the response cache.
+            results_key (str): The key holding the items of a page.
+            auth (str): The transport authentication mode.
+
+        Returns:
+            callable: A fetcher taking (url, params) and returning (items, next page spec).
+        """
+        def fetch(spec):
+            url, params = spec
+            response = self.transport.get(url, params=params, auth=auth, endpoint=endpoint)
+            response.raise_for_status()
+            data = response.json()
+            # the next link already carries the query parameters
+            next_url = data.get('next') if isinstance(data, dict) else None
+            return data.get(results_key, []), ((next_url, None) if next_url else None)
+        return fetch
+
+    def iter_projects(self, page_size=100, prefetch=True, search=None):
+        """
+        Iterate over every project, walking all the pages of the listing.
+
+        Args:
+            page_size (int): The number of projects requested per page.
+            prefetch (bool): Fetch the next page in the background while the current one is consumed.
+            search (str): Only list the projects matching this text, filtered by the server.
+
+        Yields:
+            dict: The next project.
+        """
+        params = {'page_size': page_size}
+        if search:
+            params['search'] = search
+        start = (f"{self.host}/api/projects/", params)
+        return paginate(self._fetch_page('projects'), start, prefetch)
+
+    def iter_datasets(self, project_id=None, page_size=100, prefetch=True, search=None):
+        """
+        Iterate over every dataset folder of a project, walking all the pages of the listing.
+
+        Args:
+            project_id (str): The ID of the project, defaults to the selected project.
+            page_size (int): The number of dataset folders requested per page.
+            prefetch (bool): Fetch the next page in the background while the current one is consumed.
+            search (str): Only list the dataset folders matching this text, filtered by the server.
 
-    def get_projects(self):
+        Yields:
+            dict: The next dataset folder.
+        """
+        project_id = project_id or self.project_id
+        params = {'page_size': page_size}
+        if search:
+            params['search'] = search
+        start = (f"{self.host}/api/projects/{project_id}/list-dataset-folders/", params)
+        return paginate(self._fetch_page('datasets'), start, prefetch)
+
+    def iter_models(self, page_size=100, fields=('dag_id', 'description'), prefetch=True, search=None):
+        """
+        Iterate over every Airflow DAG, walking all the pages of the listing.
+
+        Args:
+            page_size (int): The number of DAGs requested per page.
+            fields (tuple): The DAG fields requested from Airflow, None for all of them.
+            prefetch (bool): Fetch the next page in the background while the current one is consumed.
+            search (str): Only list the DAGs whose ID contains this text, filtered by Airflow.
+
+        Yields:
+            dict: The next DAG.
+        """
+        url = f"{self.host_airflow}/api/v1/dags"
+
+        def fetch(offset):
+            params = {'limit': page_size, 'offset': offset}
+            if fields:
+                params['fields'] = ','.join(fields)
+            if search:
+                params['dag_id_pattern'] = search
+            response = self.transport.get(url, params=params, auth='airflow', endpoint='models')
+            response.raise_for_status()
+            data = response.json()
+            dags = data.get('dags', [])
+            next_offset = offset + len(dags)
+            more = dags and next_offset < data.get('total_entries', 0)
+            return dags, (next_offset if more else None)
+        return paginate(fetch, 0, prefetch)
+
+    def get_projects(self, show=True):
         """
         Get the list of projects.
 
+        Args:
+            show (bool): Print the projects as a table.
+
         Returns:
-            None
+            list: The project_record of every project, empty if the request failed.
         """
-        url = f"{self.host}/api/projects/"
-        response = requests.get(url, headers=self._authorized_headers())
-        if response.status_code == 200:
-            self.projects_data = response.json().get('results', [])
+        try:
+            self.projects_data = self.catalog.sync_projects()
+        except requests.exceptions.RequestException as err:
+            logging.error(f"An error occurred while listing projects: {err}")
+            print("Error fetching projects.")
+            return []
+        # Update the project lookup dictionary
+        self.projects.update((project.id, project.name) for project in self.projects_data)
+        if show:
             if self.projects_data:
-                # Prepare data for table
-                table_data = []
-                for project in self.projects_data:
-                    row = [
-                        project.get('id'),
-                        project.get('name'),
-                        project.get('created_at'),
-                        "Selected" if project.get('id') == self.project_id else "Not Selected"
-                    ]
-                    table_data.append(row)
-                    # Update the project lookup dictionary
-                    self.projects[project.get('id')] = project.get('name')
-
-                # Define table headers
-                headers = ['Project ID', 'Project Name', 'Created At', 'Status']
-
-                # Print table
                 print("Projects:")
-                print(tabulate(table_data, headers=headers, tablefmt='pretty'))
+                print_records(self.projects_data, selected=self.project_id)
             else:
                 print("No projects found.")
-        else:
-            print("Error fetching projects.")
+        return self.projects_data
     
     def select_project(self, project_id):
         if project_id in self.projects:
@@ -280,62 +499,58 @@ class syntheticus_client:
         wrapped_text = '\n'.join(wrapped_lines)
         return wrapped_text
     
-    def get_datasets(self):
+    def get_datasets(self, show=True, context=None):
         """
-        List the dataset folders for a project.
+        List the datasets of the selected project.
 
         Args:
-            project_id (str): The ID of the project.
+            show (bool): Print the datasets as a table.
+            context (request_context): The project to list instead of the selected one.
 
         Returns:
-            dict: The response JSON containing the dataset folders.
+            list: The dataset_record of every dataset, empty if no valid project is selected or the request failed.
         """
         
+        ctx = self._context(context)
         # Check if project_id exists in the lookup dictionary
-        if self.project_id not in self.projects:
+        if ctx.project_id not in self.projects:
             print("Please select a valid project ID.")
-            return
-        url = f"{self.host}/api/projects/{self.project_id}/list-dataset-folders/"
-        payload = {}
-        files = {}
-        headers = {
-        'Authorization': f'Token {self.token}'
-        }
+            return []
+        try:
+            datasets = self.catalog.sync_datasets(ctx.project_id)
+        except requests.exceptions.RequestException as err:
+            logging.error(f"An error occurred while listing datasets: {err}")
+            print("Error fetching datasets.")
+            return []
+
+        if context is None:
+            # a folder can hold several datasets, key them by folder ID and name
+            self.datasets_data = datasets
+            self.datasets = {(dataset.id, dataset.name): dataset for dataset in datasets}
+        if show:
+            print_records(datasets, selected=ctx.dataset_id)
+        return datasets
+
+    def select_dataset(self, dataset_id, dataset_name=None):
+        """
+        Select a dataset.
 
-        response = requests.request("GET", url, headers=headers, data=payload, files=files)
-        self.data = json.loads(response.text)
-
-        # Prepare data for table
-        self.table_data = []
-        for result in self.data.get('results', []):
-            for outer_dataset in result.get('datasets', []):
-                for dataset in outer_dataset.get('datasets', []):
-                    row = [
-                        dataset.get('dataset_name'),
-                        result.get('id'),
-                        result.get('project'),
-                        result.get('data_type'),
-                        dataset.get('size'),
-                        dataset.get('rows_number'),
-                        len(dataset.get('dataset_metadata', {}).get('column_types', {})),
-                        'Selected' if self.dataset_id == result.get('id') else 'Not Selected',
-                    ]
-                    self.table_data.append(row)
-
-                    # Add the dataset to the lookup dictionary using its unique ID as the key
-                    self.datasets[result.get('id')] = dataset.get('dataset_name')
-
-        # Define table headers
-        headers = ['Dataset Name', 'Dataset ID', 'Project ID', 'Data Type', 'Size', 'Number of Rows', 'Number of Columns', 'Status']
-
-        # Print table
-        print(tabulate(self.table_data, headers=headers, tablefmt='pretty'))
-
-    def select_dataset(self, dataset_id):
-        if dataset_id in self.datasets:
+        Args:
+            dataset_id (str): The ID of the dataset folder.
+            dataset_name (str): The name of the dataset, needed when the folder holds several datasets.
+        """
+        if self.project_id is None:
+            print("Please select a project first.")
+            return
+        # a name can exist in several projects, only look in the selected one
+        matches = self.catalog.datasets(project_id=self.project_id, dataset_id=dataset_id, name=dataset_name)
+        if len(matches) == 1:
             self.dataset_id = dataset_id
-            self.dataset_name  = self.datasets[dataset_id]  
-            print(f"Dataset selected: {dataset_id} with name {self.datasets[dataset_id]}")
+            self.dataset_name = matches[0].name
+            print(f"Dataset selected: {dataset_id} with name {self.dataset_name}")
+        elif matches:
+            names = ', '.join(sorted(dataset.name for dataset in matches))
+            print(f"Dataset folder {dataset_id} holds several datasets ({names}), pass dataset_name.")
         else:
             print(f"Dataset with ID {dataset_id} not found.")
 
@@ -351,8 +566,12 @@ class syntheticus_client:
             str: The status message indicating the success or failure of the project deletion.
         """
         url = f"{self.host}/api/projects/{project_id}/"
-        response = requests.delete(url, headers=self._authorized_headers())
+        response = self.transport.delete(url)
         if response.status_code == 204:
+            self.transport.invalidate('projects')
+            self.transport.invalidate(match=project_id)
+            self.catalog.forget_project(project_id)
+            self.projects.pop(project_id, None)
             return "Project deleted successfully."
         else:
             return "Error deleting project."
@@ -365,41 +584,266 @@ class syntheticus_client:
             '.csv': 'text/csv',
         }.get(extension, 'application/octet-stream')
 
-    def upload_data(self, dataset_name, folder_path, file_names):
+    @property
+    def upload_manifest(self):
+        """
+        The local manifest of uploaded file hashes, loaded on first use.
+        """
+        if self._upload_manifest is None:
+            with self._lock:
+                if self._upload_manifest is None:
+                    self._upload_manifest = upload_manifest()
+        return self._upload_manifest
+
+    def _manifest_key(self, project_id, dataset_name, file_name):
+        return upload_manifest.key(self.host, project_id, dataset_name, file_name)
+
+    def _server_file_hashes(self, project_id, dataset_name):
+        """
+        Collect the content hashes the server reports for the files of a dataset folder.
+
+        The listing only carries hashes when the server exposes a 'sha256' field on the
+        dataset entries; otherwise the result is empty and the local manifest is used alone.
+
+        Args:
+            project_id (str): The ID of the project.
+            dataset_name (str): The name of the dataset folder.
+
+        Returns:
+            dict: The hash of every file name reported by the server.
+        """
+        hashes = {}
+        try:
+            for result in self.iter_datasets(project_id):
+                for outer_dataset in result.get('datasets', []):
+                    if outer_dataset.get('dataset_name') not in (None, dataset_name):
+                        continue
+                    for dataset in outer_dataset.get('datasets', []):
+                        if dataset.get('sha256'):
+                            hashes[dataset.get('dataset_name')] = dataset['sha256']
+        except requests.exceptions.RequestException as err:
+            logging.warning(f"Could not read the dataset hashes from the server: {err}")
+        return hashes
+
+    def upload_data(self, dataset_name, folder_path, file_names, stream=False, chunk_size=1024 * 1024, progress=None,
+                    skip_unchanged=False, hash_workers=4, compression=None, compress_workers=4,
+                    compress_min_size=64 * 1024, metadata=None, context=None):
+        """
+        Upload data files into a dataset folder of the selected project.
+
+        Args:
+            dataset_name (str): The name to be assigned to the dataset.
+            folder_path (str): The local folder containing the files.
+            file_names (list): The names of the files to upload.
+            stream (bool): Encode the multipart body incrementally from disk instead of
+                building it in memory. Use it for large datasets.
+            chunk_size (int): The read buffer size used in streaming mode.
+            progress (callable or bool): In streaming mode, a callback called with
+                (bytes sent, total bytes, bytes per second), or True to print the throughput.
+            skip_unchanged (bool): Hash the files and skip the ones already uploaded with the
+                same content to this dataset folder, according to the local upload manifest
+                and the hashes reported by the server, if any.
+            hash_workers (int): The number of files hashed in parallel.
+            compression (str): Compress the files before sending them: 'gzip', 'zstd', or
+                'auto' for zstd when zstandard is installed. Compressed files are renamed with
+                a .gz/.zst suffix, sent with the matching content type, and the codec is sent
+                in the 'compression' form field.
+            compress_workers (int): The number of files compressed in parallel.
+            compress_min_size (int): Files smaller than this number of bytes are sent uncompressed.
+            metadata (dict): Metadata sent as metadata.json from memory, e.g. the result of
+                ``infer_metadata``. Use it instead of listing a metadata.json in file_names.
+            context (request_context): The project to upload to instead of the selected one.
+
+        Returns:
+            bool: True if the files were uploaded or were all unchanged.
+        """
+        project_id = self._context(context).project_id
         # Check if project_id exists in the lookup dictionary
-        if self.project_id not in self.projects:
+        if project_id not in self.projects:
             print("Please select a valid project ID.")
-            return
-
-        url = f"{self.host}/api/projects/{self.project_id}/upload-data/"
+            return False
+
+        if skip_unchanged:
+            paths = {file_name: os.path.join(folder_path, file_name) for file_name in file_names}
+            digests = self.upload_manifest.file_hashes(list(paths.values()), hash_workers)
+            server_hashes = self._server_file_hashes(project_id, dataset_name)
+            unchanged = [
+                file_name for file_name in file_names
+                if server_hashes.get(file_name) == digests[paths[file_name]]
+                or self.upload_manifest.unchanged(self._manifest_key(project_id, dataset_name, file_name), digests[paths[file_name]])
+            ]
+            if unchanged:
+                print(f"Skipping unchanged files: {', '.join(unchanged)}")
+            file_names = [file_name for file_name in file_names if file_name not in unchanged]
+            if not file_names and metadata is None:
+                print('All files are unchanged, nothing to upload.')
+                return True
+
+        url = f"{self.host}/api/projects/{project_id}/upload-data/"
         payload = {'dataset_folder_name': dataset_name}
-        files = [
-            ('files', (file_name, open(f'{folder_path}/{file_name}','rb'), self.get_mime_type(file_name))) for file_name in file_names
-        ]
-        headers = {
-            'Authorization': f'Token {self.token}'
-        }
 
-        response = requests.request("POST", url, headers=headers, data=payload, files=files)
+        with ExitStack() as stack:
+            # (uploaded name, local path, content type) of every file
+            uploads = [(file_name, os.path.join(folder_path, file_name), self.get_mime_type(file_name)) for file_name in file_names]
+
+            if compression:
+                codec = resolve_codec(compression)
+                suffix, content_type = COMPRESSION_CODECS[codec]
+                large = [path for _, path, _ in uploads if os.path.getsize(path) >= compress_min_size]
+                compressed = compress_files(large, stack.enter_context(TemporaryDirectory()), codec,
+                                            compress_workers, chunk_size)
+                uploads = [(name + suffix, compressed[path], content_type) if path in compressed else (name, path, mime)
+                           for name, path, mime in uploads]
+                payload['compression'] = codec
+
+            if metadata is not None:
+                uploads.append(('metadata.json', json.dumps(metadata).encode(), 'application/json'))
+
+            if stream:
+                if progress is True:
+                    progress = print_progress()
+                encoder = multipart_encoder(payload, [
+                    ('files', name, path, mime) for name, path, mime in uploads
+                ], chunk_size=chunk_size, progress=progress)
+                try:
+                    response = self.transport.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+                finally:
+                    encoder.close()
+            else:
+                files = [
+                    ('files', (name, path if isinstance(path, bytes) else stack.enter_context(open(path, 'rb')), mime))
+                    for name, path, mime in uploads
+                ]
+                response = self.transport.post(url, data=payload, files=files)
         
         # Check if request was successful
         if response.status_code == 200:
+            self.transport.invalidate('datasets', project_id)
+            if skip_unchanged:
+                for file_name in file_names:
+                    self.upload_manifest.record(self._manifest_key(project_id, dataset_name, file_name), paths[file_name], digests[paths[file_name]])
+                self.upload_manifest.save()
             print('Files uploaded successfully.')
+            return True
+        print(f'Error occurred while uploading files: {response.text}')
+        return False
+
+    def upload_data_sharded(self, dataset_name, folder_path, file_name, other_files=(), metadata=None,
+                            shard_size=256 * 1024 * 1024, max_workers=4, retries=3, chunk_size=1024 * 1024,
+                            context=None):
+        """
+        Upload a large CSV as row-aligned shards sent concurrently.
+
+        The file is split into shards of about ``shard_size`` bytes ending on a line
+        boundary, each starting with the CSV header, and every shard is streamed in
+        its own request over a worker pool. A failed shard is retried on its own with
+        exponential backoff. Only once every shard has been confirmed, the dataset
+        folder is finalised with a last request carrying the other files (e.g.
+        metadata.json) and a shards.json manifest listing the parts in order.
+
+        Args:
+            dataset_name (str): The name to be assigned to the dataset.
+            folder_path (str): The local folder containing the files.
+            file_name (str): The CSV file to shard.
+            other_files (list): Files sent with the finalising request, e.g. ['metadata.json'].
+            metadata (dict): Metadata sent as metadata.json from memory with the finalising request.
+            shard_size (int): The approximate size in bytes of every shard.
+            max_workers (int): The number of shards uploaded at the same time.
+            retries (int): The number of retries of a failed shard.
+            chunk_size (int): The read buffer size used to stream the shards.
+            context (request_context): The project to upload to instead of the selected one.
+
+        Returns:
+            dict: 'shards', a list of per-shard dicts with the keys 'index', 'name', 'bytes',
+            'attempts', 'status' and 'error', and 'finalized', True once the folder was finalised.
+        """
+        project_id = self._context(context).project_id
+        # Check if project_id exists in the lookup dictionary
+        if project_id not in self.projects:
+            print("Please select a valid project ID.")
+            return {'shards': [], 'finalized': False}
+
+        url = f"{self.host}/api/projects/{project_id}/upload-data/"
+        path = os.path.join(folder_path, file_name)
+        header = read_header(path)
+        ranges = row_aligned_ranges(path, shard_size)
+        stem, extension = os.path.splitext(file_name)
+        names = [f"{stem}.part{index:05d}{extension}" for index in range(len(ranges))]
+
+        def upload_shard(index):
+            start, end = ranges[index]
+            fields = {'dataset_folder_name': dataset_name, 'shard_of': file_name,
+                      'shard_index': index, 'shard_count': len(ranges)}
+            result = {'index': index, 'name': names[index], 'bytes': len(header) + end - start,
+                      'attempts': 0, 'status': 'error', 'error': None}
+            for attempt in range(retries + 1):
+                result['attempts'] = attempt + 1
+                encoder = multipart_encoder(fields, [('files', names[index], (path, start, end, header), 'text/csv')],
+                                            chunk_size=chunk_size)
+                try:
+                    response = self.transport.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+                    if response.status_code == 200:
+                        result['status'] = 'ok'
+                        result['error'] = None
+                        return result
+                    result['error'] = f"HTTP {response.status_code}: {response.text}"
+                    if response.status_code < 500 and response.status_code != 429:
+                        return result
+                except requests.exceptions.RequestException as err:
+                    result['error'] = str(err)
+                finally:
+                    encoder.close()
+                if attempt < retries:
+                    time.sleep(min(2 ** attempt, 30))
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            shards = list(executor.map(upload_shard, range(len(ranges))))
+
+        finalized = False
+        failed = [shard['name'] for shard in shards if shard['status'] != 'ok']
+        if failed:
+            print(f"Error occurred while uploading shards: {', '.join(failed)}. The dataset was not finalised.")
         else:
-            print(f'Error occurred while uploading files: {response.text}')
-        return
+            manifest = {'file_name': file_name, 'shards': names, 'header': header.decode().rstrip('\r\n')}
+            files = [('files', 'shards.json', json.dumps(manifest).encode(), 'application/json')]
+            files += [('files', other, os.path.join(folder_path, other), self.get_mime_type(other)) for other in other_files]
+            if metadata is not None:
+                files.append(('files', 'metadata.json', json.dumps(metadata).encode(), 'application/json'))
+            encoder = multipart_encoder({'dataset_folder_name': dataset_name, 'finalize': 'true'}, files, chunk_size=chunk_size)
+            try:
+                response = self.transport.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+            except requests.exceptions.RequestException as err:
+                print(f'Error occurred while finalising the dataset: {err}')
+                return {'shards': shards, 'finalized': False}
+            finally:
+                encoder.close()
+            if response.status_code == 200:
+                finalized = True
+                self.transport.invalidate('datasets', project_id)
+                print(f'{len(shards)} shards uploaded and dataset finalised successfully.')
+            else:
+                print(f'Error occurred while finalising the dataset: {response.text}')
+        return {'shards': shards, 'finalized': finalized}
+
+    @staticmethod
+    def base_config(dataset_id):
+        """
+        Build the basic configuration for a dataset.
 
-    def upload_conf(self):
-        url_upload_conf = f'{self.host}/api/projects/{self.project_id}/update-conf-file/'
+        Args:
+            dataset_id (str): The ID of the dataset version to use.
 
-        # Prepare the configuration data
-        config_data = {
+        Returns:
+            dict: The configuration data.
+        """
+        return {
             'config_version': '1.0',
             'config_name': 'base',
             'config_steps': [
                 {
                     'data': {
-                        'dataset_version': self.dataset_id,  # Use the selected project ID
+                        'dataset_version': dataset_id,  # Use the selected dataset ID
                     },
                 },
                 {'transform': None},
@@ -413,111 +857,278 @@ class syntheticus_client:
             ]
         }
 
-        # Save configuration data to a YAML file with the same name as the project
-        self.config_file_path = f"{self.project_name}.yaml"
-        yaml = YAML()
-        with open(self.config_file_path, 'w') as file:
-            yaml.dump(config_data, file)
+    def _post_config(self, project_id, file_name, content):
+        """
+        Upload a configuration file to a project.
+
+        Args:
+            project_id (str): The ID of the project.
+            file_name (str): The file name reported to the server.
+            content (bytes or file): The YAML configuration.
 
-        headers = {'Authorization': f'Token {self.token}'}
-        files = [('file', (self.config_file_path, open(self.config_file_path, 'rb'), 'text/yaml'))]
-        response = requests.request("POST", url_upload_conf, headers=headers, files=files)
+        Returns:
+            requests.Response: The response.
+        """
+        url_upload_conf = f'{self.host}/api/projects/{project_id}/update-conf-file/'
+        files = [('file', (file_name, content, 'text/yaml'))]
+        return self.transport.post(url_upload_conf, files=files)
 
-        if response.status_code == 200:
-            print(f"A basic configuration file has been uploaded in the project {self.project_id}.")
-            print(f"If you want to modify the config file, open the file with {self.project_name}.yaml and customize it.")
+    def _upload_config_content(self, project_id, file_name, content, force=False):
+        """
+        Upload a serialised configuration unless this client already uploaded the same content.
+
+        Args:
+            project_id (str): The ID of the project.
+            file_name (str): The file name reported to the server.
+            content (bytes): The YAML configuration.
+            force (bool): Upload even if the content did not change.
+
+        Returns:
+            str: 'uploaded' or 'unchanged'.
+
+        Raises:
+            requests.exceptions.RequestException: If the upload fails.
+        """
+        digest = config_digest(content)
+        if not force and self._config_digests.get(project_id) == digest:
+            return 'unchanged'
+        response = self._post_config(project_id, file_name, content)
+        response.raise_for_status()
+        with self._lock:
+            self._config_digests[project_id] = digest
+        return 'uploaded'
+
+    def upload_config(self, config, context=None, force=False):
+        """
+        Validate a configuration and upload it from memory.
+
+        The hash of the last configuration uploaded to every project is kept, so
+        templating the same configuration over many projects, or calling this again
+        with an unchanged configuration, only sends what changed. The hashes only
+        cover the uploads of this client: use ``force`` if the configuration may
+        have been changed by someone else.
+
+        Args:
+            config (dict): The configuration, see ``base_config``.
+            context (request_context): The project to configure instead of the selected one.
+            force (bool): Upload even if the configuration did not change.
+
+        Returns:
+            str: 'uploaded' or 'unchanged'.
+
+        Raises:
+            ValueError: If the configuration is malformed.
+            requests.exceptions.RequestException: If the upload fails.
+        """
+        ctx = self._context(context)
+        validate_config(config)
+        file_name = f"{ctx.project_name or ctx.project_id}.yaml"
+        return self._upload_config_content(ctx.project_id, file_name, dump_config(config), force)
+
+    def upload_conf(self, context=None, save=True, force=False):
+        """
+        Upload the basic configuration of the selected dataset.
+
+        The configuration is built and uploaded from memory. With ``save`` a copy is
+        written to {project_name}.yaml, to be customised and sent with update_conf().
+        A context carrying only the project ID uses {project_id}.yaml instead.
+
+        Args:
+            context (request_context): The project and dataset to use instead of the selected ones.
+            save (bool): Write the editable copy of the configuration.
+            force (bool): Upload even if this client already uploaded the same configuration.
+        """
+        ctx = self._context(context)
+
+        # Prepare the configuration data
+        config_data = self.base_config(ctx.dataset_id)
+        content = dump_config(config_data)
+
+        config_file_path = f"{ctx.project_name or ctx.project_id}.yaml"
+        if context is None:
+            self.config_file_path = config_file_path
+        if save:
+            # Save configuration data to a YAML file with the same name as the project
+            with open(config_file_path, 'wb') as file:
+                file.write(content)
+
+        try:
+            status = self._upload_config_content(ctx.project_id, config_file_path, content, force)
+        except requests.exceptions.RequestException as err:
+            print(f"Error occurred while uploading the configuration file: {err}")
+            return
+        if status == 'unchanged':
+            print(f"The basic configuration of the project {ctx.project_id} is already uploaded.")
+            return
+        print(f"A basic configuration file has been uploaded in the project {ctx.project_id}.")
+        if save:
+            print(f"If you want to modify the config file, open the file with {config_file_path} and customize it.")
             print("Once finished, save and upload again using the update_conf() method.")
-        else:
-            print(f"Error occurred while uploading the configuration file: {response.text}")
             
-    def update_conf(self):
-        url_upload_conf = f'{self.host}/api/projects/{self.project_id}/update-conf-file/'
+    def update_conf(self, context=None, config=None, force=False):
+        """
+        Upload a customised configuration.
 
-        # Check if the configuration file exists
-        self.config_file_path = f"{self.project_name}.yaml"
-        if not os.path.isfile(self.config_file_path):
-            print("Configuration file not found.")
-            return
+        The configuration is validated before being sent and is not sent again if
+        it did not change since the last upload of this client.
 
-        # Upload the configuration file
-        headers = {'Authorization': f'Token {self.token}'}
-        files = [('file', (self.config_file_path, open(self.config_file_path, 'rb'), 'text/yaml'))]
-        response = requests.request("POST", url_upload_conf, headers=headers, files=files)
+        Args:
+            context (request_context): The project to use instead of the selected one.
+            config (dict): The configuration, read from {project_name}.yaml when not given.
+            force (bool): Upload even if the configuration did not change.
+        """
+        ctx = self._context(context)
+        config_file_path = f"{ctx.project_name or ctx.project_id}.yaml"
+        if context is None:
+            self.config_file_path = config_file_path
+
+        if config is None:
+            # Check if the configuration file exists
+            if not os.path.isfile(config_file_path):
+                print("Configuration file not found.")
+                return
+            with open(config_file_path, 'rb') as file:
+                content = file.read()
+            config = load_config(content)
+        else:
+            content = None
 
-        if response.status_code == 200:
-            print(f"The configuration file '{self.config_file_path}' has been successfully re-uploaded.")
+        try:
+            validate_config(config)
+        except ValueError as err:
+            print(f"The configuration is not valid: {err}")
+            return
+        try:
+            status = self._upload_config_content(ctx.project_id, config_file_path,
+                                                 content if content is not None else dump_config(config), force)
+        except requests.exceptions.RequestException as err:
+            print(f"Error occurred while re-uploading the configuration file: {err}")
+            return
+        if status == 'unchanged':
+            print(f"The configuration file '{config_file_path}' did not change, nothing to upload.")
         else:
-            print(f"Error occurred while re-uploading the configuration file: {response.text}")
+            print(f"The configuration file '{config_file_path}' has been successfully re-uploaded.")
 
-    def get_models(self):
-        """This method lists all the available models"""
-        url = f"{self.host_airflow}/api/v1/dags"
-        response = self.session.get(url)
-        if response.status_code == 200:
-            self.models = response.json().get('dags', [])
+    def get_models(self, show=True):
+        """
+        List all the available models.
+
+        Args:
+            show (bool): Print the models as a table.
+
+        Returns:
+            list: The model_record of every model, empty if the request failed.
+        """
+        try:
+            self.models = [model_record.from_json(model) for model in self.iter_models()]
+        except requests.exceptions.RequestException as err:
+            print("Error fetching models.", err)
+            return []
+        if show:
             if self.models:
                 print("Available Models:")
-                table_data = []
-                for item in self.models:
-                    dag_id = item.get('dag_id')
-                    description = item.get('description')
-                    table_data.append([dag_id, description])
-
-                headers = ['Model ID', 'Description']
-                print(tabulate(table_data, headers=headers, tablefmt='pretty'))
+                print_records(self.models)
             else:
                 print("No models available.")
-        else:
-            print("Error fetching models.",response.status_code)
+        return self.models
 
     def select_model(self, model_id):
             self.model_id = model_id
             print(f"Model {model_id} selected.")
     
+    def _airflow_get(self, url, **kwargs):
+        response = self.transport.get(url, auth='airflow', **kwargs)
+        response.raise_for_status()
+        return response.json()
+
     def get_dag(self, dag_id):
         """This method returns the details of a specific dag"""
-        url = f"{self.base_url}/api/v1/dags/{dag_id}"
-        return self._api_get(url)
+        url = f"{self.host_airflow}/api/v1/dags/{dag_id}"
+        return self._airflow_get(url)
 
     def model_runs(self, dag_id):
         """This method returns the runs of a specific dag"""
-        url = f"{self.base_url}/api/v1/dags/{dag_id}/dagRuns"
-        dag_runs = self._api_get(url)
+        url = f"{self.host_airflow}/api/v1/dags/{dag_id}/dagRuns"
+        dag_runs = self._airflow_get(url)
         for dag_run in dag_runs["dag_runs"]:
             dag_run_id = dag_run["dag_run_id"]
             state = dag_run["state"]
             logging.info(f"Model run ID: {dag_run_id}, state: {state}")
+        return dag_runs["dag_runs"]
 
-    def fit(self):
+    def run_monitor(self, **kwargs):
         """
-        Triggers the fit process for the selected model.
+        Create a monitor following DAG runs with batched, backed-off polling.
 
-        Raises:
-            Exception: If an unexpected error occurs during the fit process.
+        Args:
+            **kwargs: Passed through to ``syntheticus_run_monitor``.
 
         Returns:
-            str: A message indicating the success or failure of the fit process.
+            syntheticus_run_monitor: The monitor.
+        """
+        return syntheticus_run_monitor(self, **kwargs)
+
+    def _trigger_fit(self, project_id, model_id):
+        """
+        Trigger the fit DAG of a model on a project without touching the selection state.
+
+        Args:
+            project_id (str): The ID of the project.
+            model_id (str): The ID of the model.
+
+        Returns:
+            dict: The triggered DAG run.
 
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
         """
-        url = f"{self.host}/api/projects/{self.project_id}/run-dag/"
+        url = f"{self.host}/api/projects/{project_id}/run-dag/"
 
         payload = json.dumps({
-            "dag_name": f"{self.model_id}",
+            "dag_name": f"{model_id}",
         })
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Token {self.token}'
-        }
+        response = self.transport.post(url, data=payload, headers={'Content-Type': 'application/json'})
+        response.raise_for_status()
+        self.transport.invalidate('commits', project_id)
 
-        try:
-            response = requests.request("POST", url, headers=headers, data=payload)
-            response.raise_for_status()
+        # Join the response strings into one string
+        response_string = ''.join(json.loads(response.text))
+
+        # Convert the JSON string into a dictionary
+        return json.loads(response_string)
+
+    def submit_batch(self, jobs, **kwargs):
+        """
+        Submit many fit jobs across projects and models and track them through completion.
 
-            # Join the response strings into one string
-            response_string = ''.join(json.loads(response.text))
+        Args:
+            jobs (iterable): ``batch_job`` instances or (project_id, dataset_id, model_id[, config]) tuples.
+            **kwargs: Passed through to ``run_batch`` (max_concurrency, requests_per_second, wait, timeout).
 
-            # Convert the JSON string into a dictionary
-            response_dict = json.loads(response_string)
+        Returns:
+            list: One result dict per job, see ``run_batch``.
+        """
+        return run_batch(self, jobs, **kwargs)
+
+    def fit(self, context=None):
+        """
+        Triggers the fit process for the selected model.
+
+        Without a context the selection is cleared afterwards; a context is left as is.
+
+        Args:
+            context (request_context): The project and model to use instead of the selected ones.
+
+        Raises:
+            Exception: If an unexpected error occurs during the fit process.
+
+        Returns:
+            str: A message indicating the success or failure of the fit process.
+
+        """
+        ctx = self._context(context)
+        try:
+            response_dict = self._trigger_fit(ctx.project_id, ctx.model_id)
 
             # Print the important information in a nice way
             print(f"Project Name: {response_dict['conf']['project_name']}")
@@ -526,6 +1137,10 @@ class syntheticus_client:
             print(f"Execution Date: {response_dict['execution_date']}")
             print(f"State: {response_dict['state']}")
             print('')
+
+            # Keep the run so it can be followed with run_monitor()
+            self.last_run = {'dag_id': response_dict['dag_id'], 'dag_run_id': response_dict['dag_run_id'],
+                             'execution_date': response_dict['execution_date']}
             print('The fit process has been triggered successfully.')
             return 'The fit process has been triggered successfully.'
 
@@ -533,16 +1148,45 @@ class syntheticus_client:
             logging.error(f"An error occurred during the fit process: {err}")
             return "An error occurred during the fit process."
         finally:
-            self.project_id = None
-            self.dataset_id = None
-            self.model_id = None
-            self.config_file_path = None
+            if context is None:
+                self._clear_selection()
     
     #### the following will be deprecated in future versions. Use django API instead.    
-    def synthetize(self):
+    def _trigger_synthetize(self, project_id, model_id):
+        """
+        Start a synthesis run of a project.
+
+        Args:
+            project_id (str): The ID of the project.
+            model_id (str): The ID of the model.
+
+        Returns:
+            dict: The dag_id, dag_run_id and execution_date of the triggered DAG run.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        run_id = project_id + '_' + timestamp
+
+        url = f"{self.host_airflow}/api/v1/dags/{model_id}/dagRuns"
+        conf = {"main_data_dir": self.main_data_dir, "project_name": project_id}
+        data = {"dag_run_id": run_id, "conf": conf}
+
+        response = self.transport.post(url, auth='airflow', json=data)
+        response.raise_for_status()
+        self.transport.invalidate('commits', project_id)
+        return {'dag_id': model_id, 'dag_run_id': run_id, 'execution_date': response.json().get('execution_date')}
+
+    def synthetize(self, context=None):
         """
         Triggers the data synthesis process.
 
+        Without a context the selection is cleared afterwards; a context is left as is.
+
+        Args:
+            context (request_context): The project and model to use instead of the selected ones.
+
         Raises:
             ValueError: If project_id or model_id is not specified.
             Exception: For any other unexpected errors.
@@ -552,74 +1196,65 @@ class syntheticus_client:
             str: Error message if synthesis trigger encounters an error.
 
         """
+        ctx = self._context(context)
         try:
-            if not self.project_id or not self.model_id:
+            if not ctx.project_id or not ctx.model_id:
                 raise ValueError("Please specify project_id and model_id.")
 
-            now = datetime.now()
-            time = now.strftime("%Y-%m-%d %H:%M:%S")
-            run_id = self.project_id + '_' + time
-
-            url = f"{self.host_airflow}/api/v1/dags/{self.model_id}/dagRuns"
-            conf = {"main_data_dir": self.main_data_dir, "project_name": self.project_id}
-            data = {"dag_run_id": run_id, "conf": conf}
-
             # Print information before triggering synthesis
             print(f"Synthesis Information:")
-            print(f"Project: {self.project_name} (ID: {self.project_id})")
-            print(f"Dataset: {self.dataset_name} (ID: {self.dataset_id})")
-            print(f"Model: {self.model_id}")
-            print(f"Configuration File: {self.config_file_path}")
+            print(f"Project: {ctx.project_name} (ID: {ctx.project_id})")
+            print(f"Dataset: {ctx.dataset_name} (ID: {ctx.dataset_id})")
+            print(f"Model: {ctx.model_id}")
+            print(f"Configuration File: {ctx.config_file_path}")
 
-            response = self.session.post(url, json=data)
-            response.raise_for_status()
-
-            if response.status_code // 100 == 2:  # Check if status code is in the 2xx range
-                logging.info("Synthesis triggered successfully!")
-                return 'Synthesis triggered successfully!'
-            else:
-                logging.error(f"Synthesis trigger returned HTTP {response.status_code}: {response.text}")
-                return f"Synthesis trigger failed with HTTP {response.status_code}."
+            self.last_run = self._trigger_synthetize(ctx.project_id, ctx.model_id)
+            logging.info("Synthesis triggered successfully!")
+            return 'Synthesis triggered successfully!'
 
         except requests.exceptions.RequestException as err:
             logging.error(f"An error occurred during synthesis: {err}")
             return "An error occurred during synthesis."
         finally:
-            self.project_id = None
-            self.dataset_id = None
-            self.model_id = None
-            self.config_file_path = None
+            if context is None:
+                self._clear_selection()
+
+    def _clear_selection(self):
+        self.project_id = None
+        self.dataset_id = None
+        self.model_id = None
+        self.config_file_path = None
 
-    def list_commits(self):
+    def list_commits(self, show=True, context=None):
         """
         Lists commits for the selected project.
 
-        Returns:
-            None
-
-        Raises:
-            requests.exceptions.RequestException: If an error occurs during the API request.
+        Args:
+            show (bool): Print the commits as a table.
+            context (request_context): The project to list instead of the selected one.
 
+        Returns:
+            list: The commit_record of every commit, empty if no project is selected or the request failed.
         """
+        ctx = self._context(context)
+        if ctx.project_id is None:
+            print('Please select a project_id first.')
+            return []
         try:
-            if self.project_id is None:
-                print('Please select a project_id first.')
-            else:
-                url = f"{self.host}/api/projects/{self.project_id}/commit-logs/"
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Authorization': f'Token {self.token}'
-                }
-
-                response = requests.get(url, headers=headers)
-                response.raise_for_status()
-
-                self.commits = response.json()
-                print(f'List of experiments in the selected project ({self.project_id}):')
-                print(tabulate(self.commits, headers="keys", tablefmt="pretty"))
-
+            url = f"{self.host}/api/projects/{ctx.project_id}/commit-logs/"
+            response = self.transport.get(url, headers={'Content-Type': 'application/json'}, endpoint='commits')
+            response.raise_for_status()
         except requests.exceptions.RequestException as err:
             logging.error(f"An error occurred while listing commits: {err}")
+            return []
+
+        commits = [commit_record.from_json(commit) for commit in response.json()]
+        if context is None:
+            self.commits = commits
+        if show:
+            print(f'List of experiments in the selected project ({ctx.project_id}):')
+            print_records(commits, selected=ctx.commit)
+        return commits
 
     def select_commit(self, commit_id):
         """
@@ -638,15 +1273,138 @@ class syntheticus_client:
         else:
             print("Please select a project_id first using the select_project() method.")
 
-    def download_data(self, data_to_download):
+    @staticmethod
+    def _stream_to_file(response, path, chunk_size):
+        """
+        Write a streamed response body to disk chunk by chunk.
+
+        The body is written to a temporary file first, which is renamed once the
+        download is complete, so an interrupted download never leaves a partial
+        artifact behind.
+
+        Args:
+            response (requests.Response): A response opened with ``stream=True``.
+            path (str): The destination file.
+            chunk_size (int): The size of the chunks read from the network.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        written = 0
+        partial_path = f"{path}.part"
+        try:
+            with open(partial_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return written
+
+    def _request_download(self, project_id, commit, data_to_download):
+        """
+        Request an artifact of a commit as a streamed response.
+
+        Args:
+            project_id (str): The ID of the project.
+            commit (str): The commit ID.
+            data_to_download (str): The type of data to download.
+
+        Returns:
+            requests.Response: The response, with the body not read yet.
+        """
+        # Construct the URL for the API endpoint
+        url = f"{self.host}/api/projects/{project_id}/download-airflow-data/"
+
+        # Prepare payload for the POST request
+        payload = json.dumps({
+            "commit": f"{commit}",
+            "data_to_download": f"{data_to_download}"
+        })
+        return self.transport.post(url, data=payload, headers={'Content-Type': 'application/json'}, stream=True)
+
+    @staticmethod
+    def _artifact_extension(data_to_download, response):
+        if data_to_download == 'data_synth' or data_to_download == 'data_real':
+            return '.zip'
+        if data_to_download == 'report':
+            return '.pdf'
+        content_type = response.headers.get('Content-Type', '').split(';')[0]
+        return mimetypes.guess_extension(content_type) or ''
+
+    def download_many(self, items, output_dir='downloads', max_workers=4, chunk_size=1024 * 1024, context=None):
+        """
+        Download several artifacts of several commits concurrently.
+
+        Each artifact is streamed to ``{output_dir}/{project_id}/{commit}/{data_to_download}{ext}``
+        so downloads never collide. The number of parallel downloads should not exceed
+        the connection pool size of the client (``pool_maxsize``).
+
+        Args:
+            items (iterable): (commit, data_to_download) pairs for the selected project,
+                or (project_id, commit, data_to_download) triples.
+            output_dir (str): The root directory of the downloads.
+            max_workers (int): The maximum number of downloads in flight.
+            chunk_size (int): The size of the chunks written to disk.
+            context (request_context): The project of the pairs instead of the selected one.
+
+        Returns:
+            list: One summary dict per item with the keys 'project_id', 'commit',
+            'data_to_download', 'status' ('ok' or 'error'), 'path', 'bytes', 'seconds' and 'error'.
+        """
+        project_id = self._context(context).project_id
+        jobs = []
+        for item in items:
+            job = (project_id, *item) if len(item) == 2 else tuple(item)
+            if job[0] is None:
+                raise ValueError("Please select a project_id first or pass (project_id, commit, data_to_download) triples.")
+            if job not in jobs:
+                jobs.append(job)
+
+        def download(job):
+            project_id, commit, data_to_download = job
+            result = {'project_id': project_id, 'commit': commit, 'data_to_download': data_to_download,
+                      'status': 'ok', 'path': None, 'bytes': 0, 'seconds': 0.0, 'error': None}
+            start = time.perf_counter()
+            try:
+                with self._request_download(project_id, commit, data_to_download) as response:
+                    response.raise_for_status()
+                    folder = os.path.join(output_dir, str(project_id), str(commit))
+                    os.makedirs(folder, exist_ok=True)
+                    path = os.path.join(folder, f"{data_to_download}{self._artifact_extension(data_to_download, response)}")
+                    result['bytes'] = self._stream_to_file(response, path, chunk_size)
+                    result['path'] = path
+            except (requests.RequestException, OSError) as e:
+                result['status'] = 'error'
+                result['error'] = str(e)
+            result['seconds'] = time.perf_counter() - start
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(download, jobs))
+
+    def download_data(self, data_to_download, chunk_size=1024 * 1024, output_format='csv', max_workers=None,
+                      context=None):
         """
         Downloads data from a specified source based on the given parameters.
 
+        The artifact is streamed to disk in chunks and archives are processed from
+        the file on disk, so peak memory is about one chunk whatever the artifact size.
+
         Args:
             data_to_download (str): The type of data to download. Options are 'data_synth', 'models', 'report', 'config', 'metadata'.
+            chunk_size (int): The size of the chunks written to disk.
+            output_format (str): The format of the synthetic data extracted from the archive.
+                Options are 'csv', 'parquet', 'feather', 'lazy' to get a memory-mapped
+                syntheticus_dataset handle, or 'dataframe' to return it without writing to disk.
+            max_workers (int): The number of processes converting archive members in parallel.
+            context (request_context): The project, dataset and commit to use instead of the selected ones.
 
         Returns:
-            None
+            list: The converted files for 'data_synth'/'data_real', or the DataFrame(s)
+            or syntheticus_dataset handle(s) when output_format is 'dataframe' or 'lazy'. None otherwise.
 
         Raises:
             ConnectionError: If there's an issue with the HTTP request.
@@ -656,43 +1414,32 @@ class syntheticus_client:
             Exception: For any other unexpected errors.
 
         """
+        ctx = self._context(context)
         try:
-            if self.project_id and self.commit is not None:
-                # Construct the URL for the API endpoint
-                url = f"{self.host}/api/projects/{self.project_id}/download-airflow-data/"
-                
-                # Prepare payload for the POST request
-                payload = json.dumps({
-                    "commit": f"{self.commit}",
-                    "data_to_download": f"{data_to_download}"
-                })
-                
-                # Define headers for the POST request
-                headers = {
-                    'Content-Type': 'application/json',
-                    'Authorization': f'Token {self.token}'
-                }
-
-                # Make the POST request
-                response = requests.request("POST", url, headers=headers, data=payload)
-                
-                # Process different types of downloaded data
+            if output_format not in OUTPUT_FORMATS:
+                raise ValueError(f"output_format must be one of {', '.join(OUTPUT_FORMATS)}.")
+            if ctx.project_id and ctx.commit is not None:
+                # Make the POST request over the pooled transport, without reading the body yet
+                with self._request_download(ctx.project_id, ctx.commit, data_to_download) as response:
+                    response.raise_for_status()
+
+                    # Pick the destination file for the different types of downloaded data
+                    if data_to_download == 'data_synth' or data_to_download == 'data_real':
+                        path = f"{ctx.dataset_name}_synth.zip"
+                    elif data_to_download == 'report':
+                        path = f"{ctx.project_name}_reports.pdf"
+                    else:
+                        path = f"{ctx.project_name}_{data_to_download}{self._artifact_extension(data_to_download, response)}"
+
+                    if self.metrics is None:
+                        self._stream_to_file(response, path, chunk_size)
+                    else:
+                        with self.metrics.phase('download_body'):
+                            self._stream_to_file(response, path, chunk_size)
+
                 if data_to_download == 'data_synth' or data_to_download == 'data_real':
-                    # Save the response content to a zip file
-                    with open(f"{self.dataset_name}_synth.zip", 'wb') as f:
-                        f.write(response.content)
-                        
-                    # Extract and process files from the downloaded zip
-                    with zipfile.ZipFile(io.BytesIO(response.content), 'r') as z:
-                        for filename in z.namelist():
-                            if filename.endswith('.pkl'):
-                                # Load the DataFrame from the pickled data
-                                df = pd.read_pickle(z.open(filename))
-                                # Save the DataFrame to a csv file
-                                df.to_csv(f"{self.dataset_name}_synth.csv", index=False)
-                elif data_to_download == 'report':
-                    with open(f"{self.project_name}_reports.pdf", 'wb') as f:
-                        f.write(response.content)
+                    # Convert the pickled members of the zip on disk, one output per member
+                    return convert_archive(path, f"{ctx.dataset_name}_synth", output_format, max_workers, self.metrics)
             else:
                 print("Please select a project_id and a commit first.")
         except (ConnectionError, requests.RequestException) as e:
@@ -704,4 +1451,4 @@ class syntheticus_client:
         except ValueError as e:
             print(f"An error occurred due to invalid parameter values: {e}")
         except Exception as e:
-            print(f"An unexpected error occurred: {e}")
\ No newline at end of file
+            print(f"An unexpected error occurred: {e}")
@@ -0,0 +1,88 @@
+import hashlib
+import io
+import threading
+
+# the steps of a configuration, in the order they must appear in config_steps
+CONFIG_STEPS = ('data', 'transform', 'model', 'sample', 'metrics')
+
+_local = threading.local()
+
+
+def _yaml(typ=None):
+    # YAML instances are costly to build and not thread-safe, keep one per thread and type
+    key = f'yaml_{typ}'
+    yaml = getattr(_local, key, None)
+    if yaml is None:
+        from ruamel.yaml import YAML
+        yaml = YAML(typ=typ) if typ else YAML()
+        setattr(_local, key, yaml)
+    return yaml
+
+
+def validate_config(config):
+    """
+    Check that a configuration has the structure expected by the server.
+
+    Args:
+        config (dict): The configuration, see ``syntheticus_client.base_config``.
+
+    Raises:
+        ValueError: If the configuration is malformed, with the first problem found.
+    """
+    if not isinstance(config, dict):
+        raise ValueError(f"The configuration must be a mapping, got {type(config).__name__}.")
+    for key in ('config_version', 'config_name', 'config_steps'):
+        if key not in config:
+            raise ValueError(f"The configuration has no '{key}'.")
+    steps = config['config_steps']
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("'config_steps' must be a non-empty list.")
+    previous = -1
+    for position, step in enumerate(steps):
+        if not isinstance(step, dict) or len(step) != 1:
+            raise ValueError(f"config_steps[{position}] must be a mapping with a single step name.")
+        name, value = next(iter(step.items()))
+        if name not in CONFIG_STEPS:
+            raise ValueError(f"config_steps[{position}]: unknown step '{name}', expected one of {', '.join(CONFIG_STEPS)}.")
+        order = CONFIG_STEPS.index(name)
+        if order <= previous:
+            raise ValueError(f"config_steps[{position}]: step '{name}' is repeated or out of order, "
+                             f"expected the order {', '.join(CONFIG_STEPS)}.")
+        previous = order
+        if value is not None and not isinstance(value, dict):
+            raise ValueError(f"config_steps[{position}]: step '{name}' must be a mapping or empty.")
+    data = steps[0].get('data')
+    if not data or not data.get('dataset_version'):
+        raise ValueError("The first step must be 'data' with a 'dataset_version'.")
+
+
+def dump_config(config):
+    """
+    Serialise a configuration to YAML in memory.
+
+    Args:
+        config (dict): The configuration.
+
+    Returns:
+        bytes: The YAML document.
+    """
+    stream = io.BytesIO()
+    _yaml().dump(config, stream)
+    return stream.getvalue()
+
+
+def load_config(content):
+    """
+    Parse a YAML (or JSON) configuration.
+
+    Args:
+        content (bytes or str): The document.
+
+    Returns:
+        dict: The configuration.
+    """
+    return _yaml('safe').load(content)
+
+
+def config_digest(content):
+    return hashlib.sha256(content).hexdigest()
@@ -0,0 +1,82 @@
+from typing import NamedTuple, Optional
+
+
+class request_context(NamedTuple):
+    """
+    An immutable selection of project, dataset, model and commit.
+
+    The ``select_*`` methods of the client store the selection on the instance,
+    so one client only drives one pipeline at a time. A context carries the same
+    selection as a value: pass it with ``context=`` to the client methods and any
+    number of threads can drive their own pipelines over one shared client, its
+    connection pool and its token. The ``with_*`` methods return updated copies.
+
+    Example:
+        base = request_context().with_model('ctgan')
+        def pipeline(project, dataset):
+            context = base.with_project(project).with_dataset(dataset)
+            client.upload_conf(context=context)
+            client.fit(context=context)
+    """
+    project_id: Optional[str] = None
+    project_name: Optional[str] = None
+    dataset_id: Optional[str] = None
+    dataset_name: Optional[str] = None
+    model_id: Optional[str] = None
+    commit: Optional[str] = None
+    config_file_path: Optional[str] = None
+
+    def with_project(self, project, project_name=None):
+        """
+        Select a project.
+
+        Args:
+            project (str or project_record): The ID of the project, or its record.
+            project_name (str): The name of the project, taken from the record when not given.
+
+        Returns:
+            request_context: The updated context.
+        """
+        project_id = getattr(project, 'id', project)
+        return self._replace(project_id=project_id, project_name=project_name or getattr(project, 'name', None))
+
+    def with_dataset(self, dataset, dataset_name=None):
+        """
+        Select a dataset.
+
+        Args:
+            dataset (str or dataset_record): The ID of the dataset folder, or its record.
+            dataset_name (str): The name of the dataset, taken from the record when not given.
+
+        Returns:
+            request_context: The updated context.
+        """
+        dataset_id = getattr(dataset, 'id', dataset)
+        return self._replace(dataset_id=dataset_id, dataset_name=dataset_name or getattr(dataset, 'name', None))
+
+    def with_model(self, model):
+        """
+        Select a model.
+
+        Args:
+            model (str or model_record): The ID of the model, or its record.
+
+        Returns:
+            request_context: The updated context.
+        """
+        return self._replace(model_id=getattr(model, 'id', model))
+
+    def with_commit(self, commit):
+        """
+        Select a commit.
+
+        Args:
+            commit (str or commit_record): The ID of the commit, or its record.
+
+        Returns:
+            request_context: The updated context.
+        """
+        return self._replace(commit=getattr(commit, 'id', commit))
+
+    def with_config(self, config_file_path):
+        return self._replace(config_file_path=config_file_path)
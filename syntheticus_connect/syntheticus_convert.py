@@ -0,0 +1,143 @@
+import os
+import time
+import zipfile
+
+# file extension of every supported output format, 'dataframe' is kept in memory
+# and 'lazy' is an uncompressed Arrow file opened as a memory-mapped syntheticus_dataset
+OUTPUT_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'lazy': '.arrow',
+    'dataframe': None,
+}
+
+
+def write_dataframe(df, path, output_format):
+    """
+    Write a DataFrame to disk in the given format.
+
+    Args:
+        df (pandas.DataFrame): The data to write.
+        path (str): The destination file.
+        output_format (str): One of 'csv', 'parquet', 'feather', 'lazy'.
+    """
+    if output_format == 'csv':
+        df.to_csv(path, index=False)
+    elif output_format == 'parquet':
+        df.to_parquet(path, index=False)
+    elif output_format == 'feather':
+        df.reset_index(drop=True).to_feather(path)
+    elif output_format == 'lazy':
+        # compressed buffers cannot be memory-mapped, keep them raw
+        df.reset_index(drop=True).to_feather(path, compression='uncompressed')
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+
+def read_member(archive_path, member):
+    """
+    Load the pickled DataFrame stored in a member of a zip archive.
+
+    Args:
+        archive_path (str): The zip archive on disk.
+        member (str): The name of the member.
+
+    Returns:
+        pandas.DataFrame: The loaded data.
+    """
+    import pandas as pd
+    with zipfile.ZipFile(archive_path, 'r') as z, z.open(member) as f:
+        return pd.read_pickle(f)
+
+
+def _convert_member(archive_path, member, output_path, output_format):
+    # runs in a worker process: each worker opens the archive on its own and reports its phase timings
+    start = time.perf_counter()
+    df = read_member(archive_path, member)
+    decoded = time.perf_counter()
+    write_dataframe(df, output_path, output_format)
+    return output_path, decoded - start, time.perf_counter() - decoded
+
+
+def member_output_path(base_name, member, output_format, single):
+    """
+    Build the output file of an archive member.
+
+    Args:
+        base_name (str): The common prefix of the output files.
+        member (str): The name of the member in the archive.
+        output_format (str): The output format.
+        single (bool): True if the member is the only one converted from the archive.
+
+    Returns:
+        str: The output path, ``{base_name}{ext}`` for a single member and
+        ``{base_name}_{member}{ext}`` otherwise so members do not overwrite each other.
+    """
+    extension = OUTPUT_FORMATS[output_format]
+    if single:
+        return f"{base_name}{extension}"
+    stem = os.path.splitext(member)[0].replace('/', '_')
+    return f"{base_name}_{stem}{extension}"
+
+
+def convert_archive(archive_path, base_name, output_format='csv', max_workers=None, metrics=None):
+    """
+    Convert the pickled DataFrames of a downloaded archive.
+
+    Every ``.pkl`` member gets its own output. When there are several members the
+    conversions run in parallel on a process pool.
+
+    Args:
+        archive_path (str): The zip archive on disk.
+        base_name (str): The common prefix of the output files.
+        output_format (str): One of 'csv', 'parquet', 'feather', 'lazy' or 'dataframe'.
+        max_workers (int): The size of the process pool, defaults to the number of CPUs.
+            Use 1 to convert in the current process.
+        metrics (syntheticus_metrics): Optional metrics receiving the pickle decoding and writing timings.
+
+    Returns:
+        list: The written paths. For 'dataframe' and 'lazy', the DataFrame or
+        syntheticus_dataset of a single member, or a dict of member name to
+        DataFrame or syntheticus_dataset for several members.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}. Options are {', '.join(OUTPUT_FORMATS)}.")
+
+    with zipfile.ZipFile(archive_path, 'r') as z:
+        members = [name for name in z.namelist() if name.endswith('.pkl')]
+
+    if output_format == 'dataframe':
+        frames = {}
+        for member in members:
+            start = time.perf_counter()
+            frames[member] = read_member(archive_path, member)
+            if metrics is not None:
+                metrics.record_phase('pickle_decode', time.perf_counter() - start)
+        if len(frames) == 1:
+            return next(iter(frames.values()))
+        return frames
+
+    single = len(members) == 1
+    jobs = [(archive_path, member, member_output_path(base_name, member, output_format, single), output_format)
+            for member in members]
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        converted = [_convert_member(*job) for job in jobs]
+    else:
+        # multiprocessing is only imported when a pool is needed
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            converted = list(executor.map(_convert_member, *zip(*jobs)))
+    paths = [path for path, _, _ in converted]
+    if metrics is not None:
+        for _, decode_seconds, write_seconds in converted:
+            metrics.record_phase('pickle_decode', decode_seconds)
+            metrics.record_phase(f'write_{output_format}', write_seconds)
+
+    if output_format == 'lazy':
+        from .syntheticus_dataset import syntheticus_dataset
+        if single:
+            return syntheticus_dataset(paths[0])
+        return {member: syntheticus_dataset(path) for member, path in zip(members, paths)}
+    return paths
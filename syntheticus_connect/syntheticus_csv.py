@@ -0,0 +1,105 @@
+import os
+
+
+def read_header(path):
+    """
+    Read the header line of a CSV file.
+
+    Args:
+        path (str): The CSV file.
+
+    Returns:
+        bytes: The header line, including its line terminator.
+    """
+    with open(path, 'rb') as f:
+        return f.readline()
+
+
+def row_aligned_ranges(path, target_size):
+    """
+    Split the body of a CSV file into byte ranges that end on a line boundary.
+
+    The header line is excluded from the ranges. Records containing quoted line
+    breaks are not supported, as the split points are found by looking for the
+    next newline.
+
+    Args:
+        path (str): The CSV file.
+        target_size (int): The approximate size in bytes of every range.
+
+    Returns:
+        list: (start, end) byte offsets, end excluded.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = len(f.readline())
+        while start < size:
+            end = min(start + target_size, size)
+            if end < size:
+                f.seek(end)
+                end += len(f.readline())
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+class range_reader:
+    """
+    A read-only file object limited to a byte range of a file.
+    """
+    def __init__(self, path, start, end, prefix=b''):
+        """
+        Open the range.
+
+        Args:
+            path (str): The file.
+            start (int): The first byte.
+            end (int): The byte after the last one.
+            prefix (bytes): Bytes returned before the range, e.g. a CSV header.
+        """
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+        self._prefix = prefix
+        self.len = len(prefix) + end - start
+
+    def read(self, size=-1):
+        data = b''
+        if self._prefix:
+            data, self._prefix = (self._prefix, b'') if size < 0 or size >= len(self._prefix) \
+                else (self._prefix[:size], self._prefix[size:])
+            if size >= 0:
+                size -= len(data)
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        chunk = self._file.read(size) if size else b''
+        self._remaining -= len(chunk)
+        return data + chunk
+
+    def __iter__(self):
+        # lets pandas treat the range as a regular file object
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+    def readline(self, size=-1):
+        if self._prefix:
+            newline = self._prefix.find(b'\n')
+            if newline >= 0:
+                return self.read(newline + 1)
+            return self.read(len(self._prefix)) + self.readline(size)
+        line = self._file.readline(min(self._remaining, size) if size >= 0 else self._remaining)
+        self._remaining -= len(line)
+        return line
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,170 @@
+from bisect import bisect_right
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+
+class syntheticus_dataset:
+    """
+    A lazy handle on a synthetic table stored as an uncompressed Arrow/Feather file.
+
+    The file is memory-mapped, so opening the handle, selecting columns or slicing
+    rows only touches the pages that are actually read. Nothing is materialised
+    until ``to_pandas`` or ``to_table`` is called.
+
+    Example:
+        dataset = client.download_data('data_synth', output_format='lazy')
+        ages = dataset.select(['age'])[1000:2000].to_pandas()
+        for batch in dataset.iter_batches(columns=['age', 'income']):
+            ...
+    """
+    def __init__(self, path, columns=None, _reader=None):
+        """
+        Open a dataset handle.
+
+        Args:
+            path (str): The Arrow/Feather file on disk.
+            columns (list): Optional subset of columns exposed by the handle.
+        """
+        if pa is None:
+            raise ImportError("syntheticus_dataset requires pyarrow: pip install syntheticus_connect[arrow]")
+        self.path = path
+        self._reader = _reader or ipc.open_file(pa.memory_map(path, 'r'))
+        self._columns = list(columns) if columns is not None else None
+        self._offsets = None
+
+    def __repr__(self):
+        return f"syntheticus_dataset(path={self.path!r}, rows={self.num_rows}, columns={self.columns})"
+
+    @property
+    def schema(self):
+        """
+        The Arrow schema of the selected columns.
+        """
+        schema = self._reader.schema
+        if self._columns is None:
+            return schema
+        return pa.schema([schema.field(name) for name in self._columns])
+
+    @property
+    def columns(self):
+        """
+        The names of the selected columns.
+        """
+        return self.schema.names
+
+    @property
+    def num_rows(self):
+        """
+        The number of rows, read from the batch metadata only.
+        """
+        return self._batch_offsets()[-1]
+
+    def __len__(self):
+        return self.num_rows
+
+    def _batch_offsets(self):
+        # cumulative row offsets of the record batches, computed once from the footer and batch headers
+        if self._offsets is None:
+            offsets = [0]
+            for i in range(self._reader.num_record_batches):
+                offsets.append(offsets[-1] + self._reader.get_batch(i).num_rows)
+            self._offsets = offsets
+        return self._offsets
+
+    def _batch(self, index, columns):
+        batch = self._reader.get_batch(index)
+        if columns is not None:
+            batch = batch.select(columns)
+        return batch
+
+    def select(self, columns):
+        """
+        Get a handle restricted to some columns.
+
+        Args:
+            columns (list): The names of the columns to keep.
+
+        Returns:
+            syntheticus_dataset: A new lazy handle on the same file.
+        """
+        missing = set(columns) - set(self.columns)
+        if missing:
+            raise KeyError(f"Unknown columns: {', '.join(sorted(missing))}")
+        handle = syntheticus_dataset(self.path, columns, _reader=self._reader)
+        handle._offsets = self._offsets
+        return handle
+
+    def iter_batches(self, columns=None, batch_size=None):
+        """
+        Iterate over the data as record batches without loading the whole table.
+
+        Args:
+            columns (list): Optional subset of the selected columns.
+            batch_size (int): Optional maximum number of rows per batch.
+
+        Yields:
+            pyarrow.RecordBatch: The next batch.
+        """
+        handle = self.select(columns) if columns is not None else self
+        for i in range(self._reader.num_record_batches):
+            batch = self._batch(i, handle._columns)
+            if batch_size is None:
+                yield batch
+            else:
+                for start in range(0, batch.num_rows, batch_size):
+                    yield batch.slice(start, batch_size)
+
+    def slice(self, start, stop=None):
+        """
+        Read a range of rows.
+
+        Args:
+            start (int): The first row.
+            stop (int): The row after the last one, defaults to the end of the table.
+
+        Returns:
+            pyarrow.Table: The rows of the selected columns.
+        """
+        start, stop, _ = slice(start, stop).indices(self.num_rows)
+        offsets = self._batch_offsets()
+        batches = []
+        first = max(bisect_right(offsets, start) - 1, 0)
+        for i in range(first, len(offsets) - 1):
+            if offsets[i] >= stop:
+                break
+            batch = self._batch(i, self._columns)
+            lo = max(start - offsets[i], 0)
+            hi = min(stop - offsets[i], batch.num_rows)
+            batches.append(batch.slice(lo, hi - lo))
+        return pa.Table.from_batches(batches, schema=self.schema)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step not in (None, 1):
+                raise ValueError("Only contiguous row slices are supported.")
+            return self.slice(key.start or 0, key.stop)
+        if isinstance(key, str):
+            return self.select([key])
+        return self.select(list(key))
+
+    def to_table(self):
+        """
+        Materialise the selected columns as an Arrow table.
+
+        Returns:
+            pyarrow.Table: The data.
+        """
+        return self.slice(0)
+
+    def to_pandas(self):
+        """
+        Materialise the selected columns as a DataFrame.
+
+        Returns:
+            pandas.DataFrame: The data.
+        """
+        return self.to_table().to_pandas()
@@ -0,0 +1,30 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive lock shared by every process updating a file.
+
+    The lock is taken on a ``{path}.lock`` sidecar, so the file itself can be
+    replaced atomically while the lock is held. On platforms without fcntl the
+    lock is a no-op and concurrent processes may overwrite each other's updates.
+
+    Args:
+        path (str): The file being updated, its directory must exist.
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd) # closing the descriptor releases the lock
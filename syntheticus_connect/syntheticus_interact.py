@@ -1,8 +1,14 @@
-from ipywidgets import widgets, Layout, VBox, Output
+import threading
+from itertools import islice
+from ipywidgets import widgets, Layout, HBox, VBox, Output
 from IPython.display import display
 from syntheticus_connect import syntheticus_client
+from .syntheticus_records import dataset_record, model_record, project_record
 from contextlib import contextmanager
 
+# the number of matches listed in a dropdown after a search
+SEARCH_LIMIT = 500
+
 class syntheticus_interface(syntheticus_client):
     def __init__(self, host):
         super().__init__(host)  # Call the constructor of syntheticus_client
@@ -30,232 +36,212 @@ class syntheticus_interface(syntheticus_client):
         self.login_user(None)  # Initialize the login widgets
         display(self.login_username_input, self.login_password_input, self.login_button, self.login_output)
     
-    def project_select(self):
+    def _listing_widget(self, name, load, label, key, describe):
         """
-        Create a project selection dropdown widget and display selected project information.
-
-        This method fetches project data, creates a dropdown widget to select a project,
-        and displays information about the selected project.
+        Build a dropdown filled in the background.
 
-        Note:
-        If there's only one project available, the dropdown will still be enabled for selection.
+        The dropdown is displayed at once in a loading state while ``load`` runs in a
+        thread, so the kernel stays responsive however slow the listing is. The
+        options are (label, key) pairs and the selected record is looked up by key.
+        The refresh button loads the listing again and the search box sends its text
+        to ``load``, which filters on the server for catalogs too large to list.
 
         Args:
-            None
+            name (str): The kind of record, used in the messages.
+            load (callable): Takes the search text (or None) and returns the records.
+            label (callable): Formats a record for the dropdown.
+            key (callable): Returns the hashable key of a record.
+            describe (callable): Selects a record and returns the text shown below the dropdown.
 
         Returns:
-            None
+            tuple: The Dropdown, the Output area and the VBox holding the whole widget.
         """
-        # Fetch project data
-        with self.suppress_output():
-            self.get_projects()
-
-        # Prepare project strings for the dropdown
-        project_strings = []
-        for project in self.projects_data:
-            project_string = f"ID: {project['id']}, Name: {project['name']}"
-            project_strings.append(project_string)
-
-        # Set the default value for the dropdown
-        if project_strings:
-            default_value = project_strings[0]
-        else:
-            default_value = "No projects available"
-
-        # Create a Dropdown widget with adjusted width using CSS styling
-        self.project_dropdown_widget = widgets.Dropdown(
-            options=project_strings,
-            value=default_value,
+        records = {}
+        state = {'generation': 0}
+        lock = threading.Lock()
+
+        dropdown = widgets.Dropdown(
+            options=[(f"Loading {name}s...", None)],
+            value=None,
             description='Select:',
-            disabled=False,
-            layout=Layout(width='auto')  # Adjust width automatically
+            disabled=True,
+            layout=Layout(width='auto')
         )
+        search_box = widgets.Text(placeholder=f"Search {name}s", continuous_update=False)
+        refresh_button = widgets.Button(description='Refresh', icon='refresh')
+        status = widgets.Label(value=f"Loading {name}s...")
+        output_area = Output()
 
-        # Output area to display selected project info
-        self.project_output_area = Output()
+        def show(text):
+            # set the outputs directly, the context manager of Output does not work from a thread
+            output_area.outputs = ()
+            if text:
+                output_area.append_stdout(text)
 
         def update_variables(change):
-            """
-            Update variables based on the selected dropdown value.
+            record = records.get(change['new'])
+            show(describe(record) if record is not None else None)
+
+        def fill(generation, search):
+            try:
+                loaded = list(load(search))
+            except Exception as e:
+                if generation == state['generation']:
+                    status.value = f"Error loading {name}s: {e}"
+                    dropdown.disabled = False
+                return
+            with lock:
+                if generation != state['generation']:
+                    return # superseded by a newer load
+                records.clear()
+                records.update((key(record), record) for record in loaded)
+            selected = dropdown.value
+            dropdown.options = [(f"Select a {name}", None)] + [(label(record), key(record)) for record in loaded]
+            if selected in records:
+                dropdown.value = selected
+            elif len(loaded) == 1:
+                dropdown.value = key(loaded[0])
+            dropdown.disabled = False
+            matching = f" matching '{search}'" if search else ""
+            status.value = f"{len(loaded)} {name}s{matching}."
+
+        def reload(_=None):
+            with lock:
+                state['generation'] += 1
+                generation = state['generation']
+            dropdown.disabled = True
+            status.value = f"Loading {name}s..."
+            search = search_box.value.strip() or None
+            threading.Thread(target=fill, args=(generation, search), daemon=True).start()
+
+        dropdown.observe(update_variables, names='value')
+        search_box.observe(reload, names='value')
+        refresh_button.on_click(reload)
+        reload()
+
+        box = VBox([HBox([dropdown, refresh_button]), HBox([search_box, status]), output_area])
+        return dropdown, output_area, box
 
-            This function is called whenever the dropdown value changes.
-            It updates the selected project's information and displays it.
+    def project_select(self):
+        """
+        Create a project selection dropdown widget and display selected project information.
 
-            Args:
-                change (dict): A dictionary containing information about the change.
+        The projects are loaded in the background, see ``_listing_widget``. Without a
+        search the listing goes through the catalog, so a refresh only downloads the
+        pages that changed.
 
-            Returns:
-                None
-            """
-            selected_value = change['new']
-            selected_index = project_strings.index(selected_value)
-            selected_project = self.projects_data[selected_index]
-            self.project_id = selected_project['id']
-            self.project_name = selected_project['name']
+        Note:
+        If there's only one project available, it is selected automatically.
 
-            # Clear previous output and display the new project info
-            with self.project_output_area:
-                self.project_output_area.clear_output()
-                print(f"Selected Project ID: {self.project_id}")
-                print(f"Selected Project Name: {self.project_name}")
+        Args:
+            None
 
-        # Attach the update function to the dropdown's 'value' property changes
-        self.project_dropdown_widget.observe(update_variables, names='value')
+        Returns:
+            None
+        """
+        def load(search):
+            if search:
+                projects = [project_record.from_json(project) for project in
+                            islice(self.iter_projects(prefetch=False, search=search), SEARCH_LIMIT)]
+            else:
+                projects = self.catalog.sync_projects()
+            self.projects.update((project.id, project.name) for project in projects)
+            return projects
 
-        # Check if there's only one project in the dropdown
-        if len(project_strings) == 1:
-            update_variables({'new': self.project_dropdown_widget.value})
+        def describe(project):
+            self.project_id = project.id
+            self.project_name = project.name
+            return (f"Selected Project ID: {self.project_id}\n"
+                    f"Selected Project Name: {self.project_name}\n")
 
-        # Display the Dropdown widget and the output area
-        display(VBox([self.project_dropdown_widget, self.project_output_area]))
+        self.project_dropdown_widget, self.project_output_area, box = self._listing_widget(
+            'project', load, lambda project: f"ID: {project.id}, Name: {project.name}",
+            lambda project: project.id, describe)
+        display(box)
 
     def dataset_select(self):
-        with self.suppress_output():
-            self.get_datasets()
-
-        transformed_table_data = []
-        for dataset in self.table_data:
-            transformed_table_data.append({
-                'dataset_name': dataset[0],
-                'dataset_id': dataset[1],
-                'project_id': dataset[2],
-                'data_type': dataset[3],
-                'size': dataset[4],
-                'rows_number': dataset[5],
-                'num_columns': dataset[6],
-                'status': dataset[7]
-            })
-        
-        dataset_strings = [f"ID: {entry['dataset_id']}, Name: {entry['dataset_name']}" for entry in transformed_table_data]
-        dataset_strings.insert(0, "Select a dataset")
-
-        self.dataset_dropdown_widget = widgets.Dropdown(
-            options=dataset_strings,
-            value=dataset_strings[0],
-            description='Select:',
-            disabled=False,
-            layout=Layout(width='auto')
-        )
-
-        self.dataset_output_area = Output()
-
-        def update_variables(change):
-            selected_value = change['new']
-            selected_index = dataset_strings.index(selected_value)
-            selected_index = selected_index - 1
-
-            if selected_index >= 0:
-                selected_dataset = transformed_table_data[selected_index]
-                self.dataset_id = selected_dataset['dataset_id']
-                self.dataset_name = selected_dataset['dataset_name']
-
-                with self.dataset_output_area:
-                    self.dataset_output_area.clear_output()
-                    print(f"Selected dataset ID: {self.dataset_id}")
-                    print(f"Selected dataset Name: {self.dataset_name}")
-                    print(f"Project ID: {selected_dataset['project_id']}")
-                    print(f"Data Type: {selected_dataset['data_type']}")
-                    print(f"Size: {selected_dataset['size']}")
-                    print(f"Number of Rows: {selected_dataset['rows_number']}")
-                    print(f"Number of Columns: {selected_dataset['num_columns']}")
-                    print("\n")
-            else:
-                with self.dataset_output_area:
-                    self.dataset_output_area.clear_output()
+        """
+        Create a dataset selection dropdown widget for the selected project.
 
-        self.dataset_dropdown_widget.observe(update_variables, names='value')
+        The datasets are loaded in the background, refresh after selecting another project.
 
-        display(VBox([self.dataset_dropdown_widget, self.dataset_output_area]))
+        Returns:
+            None
+        """
+        def load(search):
+            project_id = self.project_id
+            if project_id is None:
+                raise ValueError("Please select a project first.")
+            if search:
+                folders = islice(self.iter_datasets(project_id, prefetch=False, search=search), SEARCH_LIMIT)
+                return [dataset for folder in folders for dataset in dataset_record.from_folder(folder)]
+            return self.catalog.sync_datasets(project_id)
+
+        def describe(dataset):
+            self.dataset_id = dataset.id
+            self.dataset_name = dataset.name
+            return (f"Selected dataset ID: {self.dataset_id}\n"
+                    f"Selected dataset Name: {self.dataset_name}\n"
+                    f"Project ID: {dataset.project_id}\n"
+                    f"Data Type: {dataset.data_type}\n"
+                    f"Size: {dataset.size}\n"
+                    f"Number of Rows: {dataset.rows_number}\n"
+                    f"Number of Columns: {dataset.n_columns}\n\n")
+
+        # a folder can hold several datasets, key them by folder ID and name
+        self.dataset_dropdown_widget, self.dataset_output_area, box = self._listing_widget(
+            'dataset', load, lambda dataset: f"ID: {dataset.id}, Name: {dataset.name}",
+            lambda dataset: (dataset.id, dataset.name), describe)
+        display(box)
 
     def model_select(self):
-        with self.suppress_output():
-            self.get_models()
-
-        models_data = []
-        for model in self.models:
-            models_data.append({
-                'id': model['dag_id'],
-                'description': model['description']
-            })
-
-        model_strings = [f"Name: {entry['id']}, description: {entry['description']}" for entry in models_data]
-        model_strings.insert(0, "Select a model")
-
-        self.model_dropdown_widget = widgets.Dropdown(
-            options=model_strings,
-            value=model_strings[0],
-            description='Select:',
-            disabled=False,
-            layout=Layout(width='auto')
-        )
-
-        self.model_output_area = Output()
-
-        def update_variables(change):
-            selected_value = change['new']
-            selected_index = model_strings.index(selected_value)
-            selected_index = selected_index - 1
-
-            if selected_index >= 0:
-                selected_model = models_data[selected_index]
-                self.model_id = selected_model['id']
-
-                with self.model_output_area:
-                    self.model_output_area.clear_output()
-                    print(f"Selected model ID: {self.model_id}")
-                    print(f"Selected model description: {selected_model['description']}")
-            else:
-                with self.model_output_area:
-                    self.model_output_area.clear_output()
-
-        self.model_dropdown_widget.observe(update_variables, names='value')
+        """
+        Create a model selection dropdown widget, the models are loaded in the background.
 
-        display(VBox([self.model_dropdown_widget, self.model_output_area]))
+        Returns:
+            None
+        """
+        def load(search):
+            return [model_record.from_json(model) for model in
+                    islice(self.iter_models(prefetch=False, search=search), SEARCH_LIMIT if search else None)]
+
+        def describe(model):
+            self.model_id = model.id
+            return (f"Selected model ID: {self.model_id}\n"
+                    f"Selected model description: {model.description}\n")
+
+        self.model_dropdown_widget, self.model_output_area, box = self._listing_widget(
+            'model', load, lambda model: f"Name: {model.id}, description: {model.description}",
+            lambda model: model.id, describe)
+        display(box)
         
     def commit_select(self):
         """
-        Displays a dropdown widget for commit selection.
+        Displays a dropdown widget for commit selection, the commits are loaded in the background.
 
         Returns:
             None
         """
-        
-        with self.suppress_output():
-            self.list_commits()  # Fetch commits data
-
-        commit_strings = [f"ID: {entry['commit']}, Message: {entry['subject']}" for entry in self.commits]
-        commit_strings.insert(0, "Select a commit")
-
-        self.commit_dropdown_widget = widgets.Dropdown(
-            options=commit_strings,
-            value=commit_strings[0],
-            description='Select:',
-            disabled=False,
-            layout=Layout(width='auto')
-        )
-
-        self.commit_output_area = Output()
-
-        def update_variables(change):
-            selected_value = change['new']
-            selected_index = commit_strings.index(selected_value)
-            selected_index = selected_index - 1
-
-            if selected_index >= 0:
-                selected_commit = self.commits[selected_index]
-                self.commit = selected_commit['commit']
-
-                with self.commit_output_area:
-                    self.commit_output_area.clear_output()
-                    print(f"Selected commit ID: {self.commit}")
-                    print(f"Selected commit message: {selected_commit['subject']}")
-            else:
-                with self.commit_output_area:
-                    self.commit_output_area.clear_output()
-
-        self.commit_dropdown_widget.observe(update_variables, names='value')
-
-        display(VBox([self.commit_dropdown_widget, self.commit_output_area]))
+        def load(search):
+            if self.project_id is None:
+                raise ValueError("Please select a project first.")
+            commits = self.list_commits(show=False)
+            if search:
+                # the commit log is not paginated, filter it here
+                search = search.lower()
+                commits = [commit for commit in commits
+                           if search in commit.id.lower() or search in (commit.subject or '').lower()]
+            return commits
+
+        def describe(commit):
+            self.commit = commit.id
+            return (f"Selected commit ID: {self.commit}\n"
+                    f"Selected commit message: {commit.subject}\n")
+
+        self.commit_dropdown_widget, self.commit_output_area, box = self._listing_widget(
+            'commit', load, lambda commit: f"ID: {commit.id}, Message: {commit.subject}",
+            lambda commit: commit.id, describe)
+        display(box)
         
     def download(self):
         """
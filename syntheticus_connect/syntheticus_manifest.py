@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .syntheticus_filelock import file_lock
+
+DEFAULT_MANIFEST_PATH = os.path.join(os.path.expanduser('~'), '.syntheticus', 'upload_manifest.json')
+
+
+def hash_file(path, chunk_size=4 * 1024 * 1024):
+    """
+    Compute the SHA-256 of a file, streaming it from disk.
+
+    Args:
+        path (str): The file to hash.
+        chunk_size (int): The size of the read buffer.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_files(paths, max_workers=4):
+    """
+    Hash several files in parallel.
+
+    hashlib releases the GIL while hashing large buffers, so threads hash files
+    on separate cores.
+
+    Args:
+        paths (list): The files to hash.
+        max_workers (int): The number of files hashed at the same time.
+
+    Returns:
+        dict: The hex digest of every path.
+    """
+    if len(paths) <= 1 or max_workers <= 1:
+        return {path: hash_file(path) for path in paths}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+        return dict(zip(paths, executor.map(hash_file, paths)))
+
+
+class upload_manifest:
+    """
+    A local record of the files uploaded to every dataset folder.
+
+    Entries are keyed by (host, project, dataset folder, file name) and hold the
+    content hash with the path, size and modification time the file had when it
+    was hashed. A file whose path, size and modification time did not change is
+    not hashed again, so checking an unchanged multi-GB dataset only costs a ``stat``.
+    """
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        """
+        Load the manifest.
+
+        Args:
+            path (str): The JSON file backing the manifest.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._recorded = set() # keys recorded since the last save
+        self.entries = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def key(host, project_id, dataset_name, file_name):
+        return f"{host}|{project_id}|{dataset_name}|{file_name}"
+
+    def file_hashes(self, paths, max_workers=4):
+        """
+        Get the hash of local files, reusing the recorded hash of files that were not modified.
+
+        Args:
+            paths (list): The files to hash.
+            max_workers (int): The number of files hashed at the same time.
+
+        Returns:
+            dict: The hex digest of every path.
+        """
+        known = {}
+        with self._lock:
+            by_stat = {(entry['path'], entry['size'], entry['mtime_ns']): entry['hash']
+                       for entry in self.entries.values()}
+        for path in paths:
+            stat = os.stat(path)
+            digest = by_stat.get((os.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+            if digest is not None:
+                known[path] = digest
+        return {**known, **hash_files([path for path in paths if path not in known], max_workers)}
+
+    def unchanged(self, key, digest):
+        with self._lock:
+            entry = self.entries.get(key)
+            return entry is not None and entry['hash'] == digest
+
+    def record(self, key, path, digest):
+        stat = os.stat(path)
+        with self._lock:
+            self.entries[key] = {'hash': digest, 'path': os.path.abspath(path),
+                                 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            self._recorded.add(key)
+
+    def save(self):
+        """
+        Write the manifest to disk atomically.
+
+        The file is re-read first and only the entries recorded since the last save
+        replace its entries. The read, merge and replace run under a lock file, so
+        concurrent processes do not drop each other's uploads.
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self._lock, file_lock(self.path):
+            entries = self._read()
+            entries.update((key, self.entries[key]) for key in self._recorded)
+            self.entries = entries
+            self._recorded.clear()
+            # a temporary file per process and thread, os.replace is atomic
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps(entries))
+            os.replace(tmp_path, self.path)
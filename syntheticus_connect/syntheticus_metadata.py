@@ -0,0 +1,158 @@
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .syntheticus_csv import range_reader, read_header, row_aligned_ranges
+
+# share of the non-null values of a text column that must parse as dates to call it a datetime
+DATETIME_RATIO = 0.95
+# number of values of every chunk of a text column tested for dates
+DATETIME_SAMPLE = 1000
+
+
+def _summarize_column(column):
+    """
+    Summarize the type evidence of one column with vectorized checks.
+
+    Args:
+        column (pandas.Series): The column.
+
+    Returns:
+        dict: The column summary, merged across chunks by ``_merge_summaries``.
+    """
+    values = column.dropna()
+    kind = column.dtype.kind
+    summary = {'kind': kind, 'count': len(values), 'integral': True, 'dates': 0}
+    if kind == 'f' and len(values):
+        summary['integral'] = bool(np.all(np.mod(values.to_numpy(), 1) == 0))
+    elif kind == 'O' and len(values):
+        # date parsing is slow, estimate the share of dates on a sample of the chunk
+        sample = values.iloc[:DATETIME_SAMPLE].astype(str)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            parsed = pd.to_datetime(sample, errors='coerce')
+        summary['dates'] = int(round(parsed.notna().mean() * len(values)))
+    return summary
+
+
+def summarize_frame(df):
+    """
+    Summarize the type evidence of every column of a DataFrame.
+
+    Args:
+        df (pandas.DataFrame): The data.
+
+    Returns:
+        dict: The summary of every column.
+    """
+    return {name: _summarize_column(column) for name, column in df.items()}
+
+
+def _merge_summaries(left, right):
+    merged = dict(left)
+    for name, summary in right.items():
+        if name not in merged:
+            merged[name] = summary
+            continue
+        current = merged[name]
+        kinds = {current['kind'], summary['kind']}
+        if len(kinds) == 1 or not summary['count']:
+            kind = current['kind']
+        elif not current['count']:
+            # an all-null chunk carries no type evidence
+            kind = summary['kind']
+        elif kinds <= {'i', 'u'}:
+            kind = 'i'
+        elif kinds <= {'i', 'u', 'f'}:
+            kind = 'f'
+        else:
+            # mixed evidence, e.g. a chunk where a numeric column only had text
+            kind = 'O'
+        merged[name] = {
+            'kind': kind,
+            'count': current['count'] + summary['count'],
+            'integral': current['integral'] and summary['integral'],
+            'dates': current['dates'] + summary['dates'],
+        }
+    return merged
+
+
+def _summarize_range(path, start, end, header, chunksize, read_csv_kwargs):
+    # runs in a worker process: parse one row-aligned byte range chunk by chunk
+    summary = {}
+    with range_reader(path, start, end, prefix=header) as reader:
+        for chunk in pd.read_csv(reader, chunksize=chunksize, **read_csv_kwargs):
+            summary = _merge_summaries(summary, summarize_frame(chunk))
+    return summary
+
+
+def _field(summary):
+    kind = summary['kind']
+    if kind == 'b':
+        return {'type': 'boolean'}
+    if kind in 'iu':
+        return {'type': 'numerical', 'subtype': 'integer'}
+    if kind == 'f':
+        return {'type': 'numerical', 'subtype': 'integer' if summary['integral'] and summary['count'] else 'float'}
+    if kind == 'M':
+        return {'type': 'datetime'}
+    if summary['count'] and summary['dates'] >= DATETIME_RATIO * summary['count']:
+        return {'type': 'datetime'}
+    return {'type': 'categorical'}
+
+
+def infer_metadata(source, chunksize=100000, processes=None, range_size=64 * 1024 * 1024, **read_csv_kwargs):
+    """
+    Build the metadata.json schema of a dataset.
+
+    Column types are inferred with vectorized pandas/NumPy checks. A CSV file is
+    split into row-aligned byte ranges parsed in parallel by a process pool, each
+    worker reading its range ``chunksize`` rows at a time, so memory stays bounded
+    by a few chunks whatever the file size.
+
+    Args:
+        source (str or pandas.DataFrame): A CSV file path or a DataFrame.
+        chunksize (int): The number of rows parsed at once by a worker.
+        processes (int): The size of the process pool, defaults to the number of CPUs.
+            Use 1 to parse in the current process.
+        range_size (int): The size in bytes of the ranges handed to the workers.
+        **read_csv_kwargs: Passed through to ``pandas.read_csv``, e.g. sep.
+
+    Returns:
+        dict: The metadata, e.g. {'fields': {'age': {'type': 'numerical', 'subtype': 'integer'}}}.
+    """
+    if isinstance(source, pd.DataFrame):
+        summary = summarize_frame(source)
+    else:
+        header = read_header(source)
+        ranges = row_aligned_ranges(source, range_size)
+        jobs = [(source, start, end, header, chunksize, read_csv_kwargs) for start, end in ranges]
+        workers = min(len(jobs), processes or os.cpu_count() or 1)
+        if workers <= 1:
+            summaries = [_summarize_range(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                summaries = list(executor.map(_summarize_range, *zip(*jobs)))
+        summary = {}
+        for part in summaries:
+            summary = _merge_summaries(summary, part)
+        if not jobs:
+            # header only: keep the columns, without any type evidence
+            columns = pd.read_csv(source, nrows=0, **read_csv_kwargs).columns
+            summary = {name: {'kind': 'O', 'count': 0, 'integral': True, 'dates': 0} for name in columns}
+
+    return {'fields': {name: _field(column) for name, column in summary.items()}}
+
+
+def write_metadata(metadata, path):
+    """
+    Write metadata to a metadata.json file.
+
+    Args:
+        metadata (dict): The metadata, see ``infer_metadata``.
+        path (str): The destination file.
+    """
+    with open(path, 'w') as f:
+        json.dump(metadata, f, indent=4)
@@ -0,0 +1,187 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_ID_SEGMENT = re.compile(r'^([0-9]+|[0-9a-fA-F]{20,}|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$')
+
+
+def endpoint_template(path):
+    """
+    Turn a request path into a low-cardinality endpoint template.
+
+    Args:
+        path (str): The URL path, e.g. /api/projects/0ed1.../commit-logs/.
+
+    Returns:
+        str: The template, e.g. /api/projects/{id}/commit-logs/.
+    """
+    segments = path.split('/')
+    for i, segment in enumerate(segments):
+        if i > 0 and segments[i - 1] == 'dags' and segment not in ('', '~'):
+            segments[i] = '{dag_id}'
+        elif i > 0 and segments[i - 1] == 'dagRuns' and segment not in ('', 'list'):
+            segments[i] = '{dag_run_id}'
+        elif _ID_SEGMENT.match(segment):
+            segments[i] = '{id}'
+    return '/'.join(segments)
+
+
+class _histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            cumulative['+Inf' if bound == float('inf') else repr(bound)] = total
+        return {'count': self.count, 'sum': self.sum, 'buckets': cumulative}
+
+
+class syntheticus_metrics:
+    """
+    Aggregated timings of the HTTP calls and processing phases of the client.
+
+    Requests are grouped by (method, endpoint template, status) with a latency
+    histogram, byte counters and a retry counter; phases such as pickle decoding
+    or CSV writing get their own histograms. The aggregates are exposed as a dict
+    snapshot and in the Prometheus text exposition format.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize empty metrics.
+
+        Args:
+            buckets (tuple): Upper bounds in seconds of the histogram buckets.
+        """
+        self.buckets = tuple(buckets)
+        self._requests = {}
+        self._phases = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, method, endpoint, status, seconds, bytes_sent=0, bytes_received=0, retries=0):
+        """
+        Record a finished HTTP call.
+
+        Args:
+            method (str): The HTTP method.
+            endpoint (str): The endpoint template.
+            status (int or str): The status code, or 'error' if no response was received.
+            seconds (float): The latency.
+            bytes_sent (int): The size of the request body.
+            bytes_received (int): The size of the response body.
+            retries (int): The number of retries made by the transport.
+        """
+        key = (method, endpoint, str(status))
+        with self._lock:
+            entry = self._requests.get(key)
+            if entry is None:
+                entry = self._requests[key] = {'latency': _histogram(self.buckets), 'bytes_sent': 0,
+                                               'bytes_received': 0, 'retries': 0}
+            entry['latency'].observe(seconds)
+            entry['bytes_sent'] += bytes_sent
+            entry['bytes_received'] += bytes_received
+            entry['retries'] += retries
+
+    def record_phase(self, name, seconds):
+        """
+        Record the duration of a processing phase.
+
+        Args:
+            name (str): The phase, e.g. 'pickle_decode'.
+            seconds (float): The duration.
+        """
+        with self._lock:
+            histogram = self._phases.get(name)
+            if histogram is None:
+                histogram = self._phases[name] = _histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time the enclosed block as a phase.
+
+        Args:
+            name (str): The phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        """
+        Get the aggregates.
+
+        Returns:
+            dict: 'requests', a list of per (method, endpoint, status) dicts, and
+            'phases', a dict of phase histograms.
+        """
+        with self._lock:
+            requests = [
+                {'method': method, 'endpoint': endpoint, 'status': status,
+                 'latency': entry['latency'].snapshot(), 'bytes_sent': entry['bytes_sent'],
+                 'bytes_received': entry['bytes_received'], 'retries': entry['retries']}
+                for (method, endpoint, status), entry in self._requests.items()
+            ]
+            phases = {name: histogram.snapshot() for name, histogram in self._phases.items()}
+        return {'requests': requests, 'phases': phases}
+
+    def to_prometheus(self, prefix='syntheticus_client'):
+        """
+        Render the aggregates in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): The metric name prefix.
+
+        Returns:
+            str: The exposition text.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f'# HELP {prefix}_request_duration_seconds Latency of the HTTP calls.',
+            f'# TYPE {prefix}_request_duration_seconds histogram',
+        ]
+        for request in snapshot['requests']:
+            labels = f'method="{request["method"]}",endpoint="{request["endpoint"]}",status="{request["status"]}"'
+            lines += _histogram_lines(f'{prefix}_request_duration_seconds', labels, request['latency'])
+        for name, help_text in (('bytes_sent', 'Request body bytes.'), ('bytes_received', 'Response body bytes.'),
+                                ('retries', 'Retries made by the transport.')):
+            lines += [f'# HELP {prefix}_request_{name}_total {help_text}', f'# TYPE {prefix}_request_{name}_total counter']
+            for request in snapshot['requests']:
+                labels = f'method="{request["method"]}",endpoint="{request["endpoint"]}",status="{request["status"]}"'
+                lines.append(f'{prefix}_request_{name}_total{{{labels}}} {request[name]}')
+        lines += [
+            f'# HELP {prefix}_phase_duration_seconds Duration of the processing phases.',
+            f'# TYPE {prefix}_phase_duration_seconds histogram',
+        ]
+        for name, histogram in snapshot['phases'].items():
+            lines += _histogram_lines(f'{prefix}_phase_duration_seconds', f'phase="{name}"', histogram)
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._phases.clear()
+
+
+def _histogram_lines(name, labels, histogram):
+    lines = [f'{name}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in histogram['buckets'].items()]
+    lines.append(f'{name}_sum{{{labels}}} {histogram["sum"]}')
+    lines.append(f'{name}_count{{{labels}}} {histogram["count"]}')
+    return lines
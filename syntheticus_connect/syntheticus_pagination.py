@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def paginate(fetch_page, start, prefetch=True):
+    """
+    Iterate over the items of every page of a listing.
+
+    With ``prefetch`` the next page is requested in a background thread as soon as
+    the current one arrives, so network latency overlaps with the consumer's work.
+
+    Args:
+        fetch_page (callable): Called with a page spec, returns (items, next page spec)
+            where the next spec is None on the last page.
+        start: The spec of the first page.
+        prefetch (bool): Fetch the next page in the background.
+
+    Yields:
+        The items of every page, in order.
+    """
+    if not prefetch:
+        spec = start
+        while spec is not None:
+            items, spec = fetch_page(spec)
+            yield from items
+        return
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(fetch_page, start)
+        while future is not None:
+            items, spec = future.result()
+            future = executor.submit(fetch_page, spec) if spec is not None else None
+            yield from items
+    finally:
+        # do not block an early exit on the page being prefetched
+        executor.shutdown(wait=False)
@@ -0,0 +1,136 @@
+from typing import NamedTuple, Optional
+
+
+class project_record(NamedTuple):
+    """
+    A project of the Syntheticus API.
+    """
+    id: str
+    name: str
+    created_at: Optional[str] = None
+
+    headers = ('Project ID', 'Project Name', 'Created At')
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get('id'), data.get('name'), data.get('created_at'))
+
+
+class dataset_record(NamedTuple):
+    """
+    A dataset stored in a dataset folder of a project.
+
+    A folder can hold several datasets, so a dataset is identified by the
+    (id, name) pair where ``id`` is the ID of its folder.
+    """
+    id: str
+    name: str
+    project_id: Optional[str] = None
+    data_type: Optional[str] = None
+    size: Optional[int] = None
+    rows_number: Optional[int] = None
+    n_columns: int = 0
+
+    headers = ('Dataset Name', 'Dataset ID', 'Project ID', 'Data Type', 'Size', 'Number of Rows', 'Number of Columns')
+
+    @classmethod
+    def from_folder(cls, folder):
+        """
+        Build the records of every dataset of a dataset folder.
+
+        Args:
+            folder (dict): A dataset folder as returned by the list-dataset-folders endpoint.
+
+        Returns:
+            list: The dataset_record of each dataset.
+        """
+        return [
+            cls(folder.get('id'), dataset.get('dataset_name'), folder.get('project'), folder.get('data_type'),
+                dataset.get('size'), dataset.get('rows_number'),
+                len(dataset.get('dataset_metadata', {}).get('column_types', {})))
+            for outer_dataset in folder.get('datasets', [])
+            for dataset in outer_dataset.get('datasets', [])
+        ]
+
+    def row(self):
+        # the name comes first in the tables
+        return (self.name, self.id) + self[2:]
+
+
+class model_record(NamedTuple):
+    """
+    A model, i.e. an Airflow DAG.
+    """
+    id: str
+    description: Optional[str] = None
+
+    headers = ('Model ID', 'Description')
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get('dag_id'), data.get('description'))
+
+
+class commit_record(NamedTuple):
+    """
+    A commit (an experiment) of a project.
+
+    The other fields of the commit log entry (date, author, ...) are kept in
+    ``extra`` and printed after the subject.
+    """
+    id: str
+    subject: Optional[str] = None
+    extra: Optional[dict] = None
+
+    headers = ('Commit', 'Subject')
+
+    @classmethod
+    def from_json(cls, data):
+        extra = {key: value for key, value in data.items() if key not in ('commit', 'subject')}
+        return cls(data.get('commit'), data.get('subject'), extra)
+
+    def row(self):
+        return (self.id, self.subject)
+
+
+class user_record(NamedTuple):
+    """
+    A user of the Syntheticus API.
+    """
+    username: str
+    name: Optional[str] = None
+    url: Optional[str] = None
+
+    headers = ('Username', 'Name', 'URL')
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get('username'), data.get('name'), data.get('url'))
+
+
+def print_records(records, selected=None):
+    """
+    Print records as a table.
+
+    This is the presentation step of the listing methods, which only build the
+    records, so scripts that never print pay no formatting cost. tabulate is
+    imported on first use.
+
+    Args:
+        records (list): Records of a single type.
+        selected (str): The ID of the selected record, adds a Status column when given.
+    """
+    from tabulate import tabulate
+    if not records:
+        return
+    headers = list(records[0].headers)
+    rows = [record.row() if hasattr(record, 'row') else tuple(record) for record in records]
+    if hasattr(records[0], 'extra'):
+        # the free-form fields, in the order they first appear
+        keys = list(dict.fromkeys(key for record in records for key in (record.extra or {})))
+        headers += keys
+        rows = [row + tuple((record.extra or {}).get(key) for key in keys) for row, record in zip(rows, records)]
+    if selected is not None:
+        headers.append('Status')
+        rows = [row + ('Selected' if record.id == selected else 'Not Selected',) for row, record in zip(rows, records)]
+    print(tabulate(rows, headers=headers, tablefmt='pretty'))
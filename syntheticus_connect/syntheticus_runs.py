@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+import requests
+
+# Airflow DAG run states after which a run never changes again
+TERMINAL_STATES = {'success', 'failed'}
+
+
+class syntheticus_run_monitor:
+    """
+    Track the state of many Airflow DAG runs at once.
+
+    All the tracked runs are refreshed with one batched request to Airflow's
+    ``/api/v1/dags/~/dagRuns/list`` endpoint instead of one GET per run. The polling
+    interval backs off while nothing changes and resets as soon as a run moves.
+
+    Example:
+        monitor = client.run_monitor()
+        client.fit()
+        monitor.track(**client.last_run)
+        states = monitor.wait_for_completion(timeout=3600)
+    """
+    def __init__(self, client, min_interval=1.0, max_interval=30.0, backoff=1.5, page_limit=100):
+        """
+        Initialize the monitor.
+
+        Args:
+            client (syntheticus_client): The client used to reach Airflow.
+            min_interval (float): The first and shortest polling interval in seconds.
+            max_interval (float): The longest polling interval in seconds.
+            backoff (float): The factor applied to the interval after a poll without changes.
+            page_limit (int): The number of runs requested per page of the batch endpoint.
+        """
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.page_limit = page_limit
+        self.runs = {} # dag_run_id -> {'dag_id', 'dag_run_id', 'state', 'execution_date', ...}
+        self._lock = threading.Lock()
+
+    def track(self, dag_id, dag_run_id, execution_date=None, **_):
+        """
+        Start tracking a DAG run.
+
+        Args:
+            dag_id (str): The ID of the DAG (the model).
+            dag_run_id (str): The ID of the run.
+            execution_date (str): The execution date of the run, used to narrow the batch query.
+        """
+        with self._lock:
+            self.runs.setdefault(dag_run_id, {'dag_id': dag_id, 'dag_run_id': dag_run_id,
+                                              'state': None, 'execution_date': execution_date})
+
+    def pending(self, run_ids=None):
+        """
+        Get the tracked runs that have not reached a terminal state.
+
+        Args:
+            run_ids (iterable): Restrict to these run IDs.
+
+        Returns:
+            list: The pending run IDs.
+        """
+        with self._lock:
+            ids = self.runs if run_ids is None else run_ids
+            return [run_id for run_id in ids if self.runs[run_id]['state'] not in TERMINAL_STATES]
+
+    def states(self, run_ids=None):
+        with self._lock:
+            ids = self.runs if run_ids is None else run_ids
+            return {run_id: self.runs[run_id]['state'] for run_id in ids}
+
+    def poll(self):
+        """
+        Refresh every pending run with batched requests.
+
+        Returns:
+            bool: True if the state of at least one run changed.
+        """
+        pending = set(self.pending())
+        if not pending:
+            return False
+        with self._lock:
+            runs = [self.runs[run_id] for run_id in pending]
+        body = {
+            'dag_ids': sorted({run['dag_id'] for run in runs}),
+            'order_by': '-execution_date',
+            'page_limit': self.page_limit,
+        }
+        dates = [run['execution_date'] for run in runs]
+        if all(dates):
+            body['execution_date_gte'] = min(dates)
+
+        url = f"{self.client.host_airflow}/api/v1/dags/~/dagRuns/list"
+        changed = False
+        seen = set()
+        offset = 0
+        while not seen >= pending:
+            body['page_offset'] = offset
+            response = self.client.transport.post(url, auth='airflow', json=body)
+            response.raise_for_status()
+            data = response.json()
+            dag_runs = data.get('dag_runs', [])
+            with self._lock:
+                for dag_run in dag_runs:
+                    run = self.runs.get(dag_run.get('dag_run_id'))
+                    if run is None or run['dag_id'] != dag_run.get('dag_id'):
+                        continue
+                    if run['dag_run_id'] in pending:
+                        seen.add(run['dag_run_id'])
+                    if run['state'] != dag_run.get('state'):
+                        changed = True
+                    run.update(state=dag_run.get('state'), execution_date=dag_run.get('execution_date'),
+                               start_date=dag_run.get('start_date'), end_date=dag_run.get('end_date'))
+            offset += len(dag_runs)
+            if not dag_runs or offset >= data.get('total_entries', 0):
+                break
+        return changed
+
+    def _prepare(self, run_ids):
+        if run_ids is None:
+            return list(self.runs)
+        ids = []
+        for run_id in run_ids:
+            if isinstance(run_id, (tuple, list)):
+                self.track(*run_id)
+                run_id = run_id[1]
+            elif run_id not in self.runs:
+                raise KeyError(f"Run {run_id} is not tracked, pass (dag_id, dag_run_id) to track it.")
+            ids.append(run_id)
+        return ids
+
+    @staticmethod
+    def _poll_failed(err):
+        # a transient failure must not abort a wait that can last hours, retry at the next interval
+        logging.warning(f"Polling the DAG runs failed, retrying: {err}")
+        return False
+
+    def wait_for_completion(self, run_ids=None, timeout=None):
+        """
+        Block until the runs reach a terminal state.
+
+        Args:
+            run_ids (iterable): Run IDs already tracked or (dag_id, dag_run_id) pairs,
+                defaults to every tracked run.
+            timeout (float): The maximum number of seconds to wait, None to wait forever.
+
+        Returns:
+            dict: The final state of every run.
+
+        Raises:
+            TimeoutError: If some runs are still pending after ``timeout`` seconds. A failed
+                poll is retried at the next interval until then.
+        """
+        ids = self._prepare(run_ids)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = self.min_interval
+        while True:
+            try:
+                changed = self.poll()
+            except requests.exceptions.RequestException as err:
+                changed = self._poll_failed(err)
+            if not self.pending(ids):
+                return self.states(ids)
+            interval = self.min_interval if changed else min(interval * self.backoff, self.max_interval)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Runs still pending: {', '.join(self.pending(ids))}")
+                interval = min(interval, remaining)
+            time.sleep(interval)
+
+    async def async_wait_for_completion(self, run_ids=None, timeout=None):
+        """
+        Wait for the runs to reach a terminal state without blocking the event loop.
+
+        Args:
+            run_ids (iterable): Run IDs already tracked or (dag_id, dag_run_id) pairs,
+                defaults to every tracked run.
+            timeout (float): The maximum number of seconds to wait, None to wait forever.
+
+        Returns:
+            dict: The final state of every run.
+
+        Raises:
+            TimeoutError: If some runs are still pending after ``timeout`` seconds. A failed
+                poll is retried at the next interval until then.
+        """
+        import asyncio
+        ids = self._prepare(run_ids)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        interval = self.min_interval
+        while True:
+            try:
+                changed = await loop.run_in_executor(None, self.poll)
+            except requests.exceptions.RequestException as err:
+                changed = self._poll_failed(err)
+            if not self.pending(ids):
+                return self.states(ids)
+            interval = self.min_interval if changed else min(interval * self.backoff, self.max_interval)
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise TimeoutError(f"Runs still pending: {', '.join(self.pending(ids))}")
+                interval = min(interval, remaining)
+            await asyncio.sleep(interval)
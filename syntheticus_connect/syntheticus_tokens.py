@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+from .syntheticus_filelock import file_lock
+
+DEFAULT_TOKEN_PATH = os.path.join(os.path.expanduser('~'), '.syntheticus', 'tokens.json')
+
+# seconds a stored token is reused before logging in again
+DEFAULT_TOKEN_TTL = 12 * 3600
+
+
+class token_store:
+    """
+    An on-disk cache of login tokens keyed by host and user.
+
+    Short-lived processes reuse the token of a previous login instead of posting
+    the password again. The file is only readable by its owner (0600, in a 0700
+    directory) and every token expires ``ttl`` seconds after the login that
+    issued it. Every write re-reads the file under a lock file, so concurrent
+    processes do not drop each other's tokens.
+    """
+    def __init__(self, path=DEFAULT_TOKEN_PATH, ttl=DEFAULT_TOKEN_TTL):
+        """
+        Load the store.
+
+        Args:
+            path (str): The JSON file backing the store.
+            ttl (float): The lifetime in seconds of a stored token.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.entries = self._read()
+
+    @staticmethod
+    def key(host, username):
+        return f"{host}|{username}"
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, host, username):
+        """
+        Get the valid token of a user.
+
+        Args:
+            host (str): The base URL of the API.
+            username (str): The user.
+
+        Returns:
+            str: The token, or None if missing or expired.
+        """
+        with self._lock:
+            entry = self.entries.get(self.key(host, username))
+        if entry is None or entry['expires_at'] <= time.time():
+            return None
+        return entry['token']
+
+    def put(self, host, username, token):
+        """
+        Store the token issued by a login.
+
+        Args:
+            host (str): The base URL of the API.
+            username (str): The user.
+            token (str): The token.
+        """
+        self._update(self.key(host, username), {'token': token, 'expires_at': time.time() + self.ttl})
+
+    def discard(self, host, username):
+        """
+        Drop the token of a user, e.g. after a logout or when the server rejects it.
+        """
+        self._update(self.key(host, username), None)
+
+    def _update(self, key, entry):
+        # the directory is created owner-only before the lock file goes in it
+        os.makedirs(os.path.dirname(self.path) or '.', mode=0o700, exist_ok=True)
+        with self._lock, file_lock(self.path):
+            self.entries = self._read()
+            now = time.time()
+            self.entries = {k: v for k, v in self.entries.items() if v['expires_at'] > now}
+            if entry is None:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = entry
+            self._write(json.dumps(self.entries))
+
+    def _write(self, data):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # create the file owner-only from the start, the token is never world-readable
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.path)
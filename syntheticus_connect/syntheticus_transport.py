@@ -0,0 +1,254 @@
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from .syntheticus_metrics import endpoint_template
+
+
+class rate_limiter:
+    """
+    A thread-safe token bucket.
+    """
+    def __init__(self, rate, burst=None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate (float): The number of requests allowed per second.
+            burst (int): The number of requests allowed back to back, defaults to ``rate``.
+        """
+        self.rate = rate
+        self.capacity = max(burst or rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a request is allowed.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class syntheticus_transport:
+    """
+    A pooled HTTP transport shared by every call of the Syntheticus client.
+
+    All requests go through a single ``requests.Session`` so TCP/TLS connections
+    are kept alive and reused between calls. The transport is also the only
+    place where authentication headers are built.
+    """
+    def __init__(self, pool_connections=4, pool_maxsize=10, timeout=(5, 60), max_retries=0,
+                 airflow_auth=('airflow', 'airflow')):
+        """
+        Initialize the transport.
+
+        Args:
+            pool_connections (int): The number of per-host connection pools to cache.
+            pool_maxsize (int): The maximum number of kept-alive connections per host.
+            timeout (float or tuple): Default (connect, read) timeout in seconds.
+            max_retries (int): Number of retries for failed connections.
+            airflow_auth (tuple): Basic auth credentials used for the Airflow API.
+        """
+        self.token = None # user token assigned at login
+        self.timeout = timeout
+        self.airflow_auth = airflow_auth # airflow credentials will be deprecated
+        self.cache = None # optional syntheticus_response_cache for the catalog endpoints
+        self.rate_limiters = {} # host (netloc) -> rate_limiter
+        self.metrics = None # optional syntheticus_metrics recording every call
+        self.reauthenticate = None # optional callable logging in again after a 401, returns True on success
+        self._reauth_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              max_retries=max_retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def auth_headers(self, content_type=None):
+        """
+        Get the headers including the authentication token.
+
+        Args:
+            content_type (str): Optional Content-Type header value.
+
+        Returns:
+            dict: The headers dictionary.
+        """
+        headers = {}
+        if self.token:
+            headers['Authorization'] = f'Token {self.token}'
+        if content_type:
+            headers['Content-Type'] = content_type
+        return headers
+
+    def request(self, method, url, auth='token', headers=None, endpoint=None, **kwargs):
+        """
+        Send a request over the pooled session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The full URL.
+            auth (str): 'token' for the Syntheticus API, 'airflow' for the Airflow API,
+                or None to send no credentials.
+            headers (dict): Extra headers merged over the authentication headers.
+            endpoint (str): The name of the catalog endpoint, used to serve GET requests
+                from the response cache when it is enabled.
+            **kwargs: Passed through to ``requests.Session.request``.
+
+        Returns:
+            requests.Response: The response. A 401 on a token-authenticated request is
+            answered by logging in again once, when ``reauthenticate`` is set, and replaying it.
+        """
+        if auth == 'airflow':
+            kwargs['auth'] = self.airflow_auth
+        kwargs.setdefault('timeout', self.timeout)
+        token = self.token
+        response = self._dispatch(method, url, auth, headers, endpoint, kwargs)
+        if (response.status_code == 401 and auth == 'token' and self.reauthenticate is not None
+                and _rewind(kwargs) and self._refresh_token(token)):
+            response.close()
+            response = self._dispatch(method, url, auth, headers, endpoint, kwargs)
+        return response
+
+    def _dispatch(self, method, url, auth, headers, endpoint, kwargs):
+        request_headers = self.auth_headers() if auth == 'token' else {}
+        if headers:
+            request_headers.update(headers)
+        if (self.cache is not None and method == 'GET' and endpoint is not None
+                and self.cache.cacheable(endpoint) and not kwargs.get('stream')):
+            return self._cached_request(url, auth, endpoint, request_headers, kwargs)
+        return self._send(method, url, request_headers, kwargs)
+
+    def _refresh_token(self, rejected_token):
+        """
+        Replace a token rejected by the server, once for all the threads that hit the 401.
+
+        Args:
+            rejected_token (str): The token the failed request was sent with.
+
+        Returns:
+            bool: True if a new token is available.
+        """
+        with self._reauth_lock:
+            if self.token != rejected_token:
+                # another thread already logged in again
+                return self.token is not None
+            return bool(self.reauthenticate()) and self.token is not None
+
+    def _send(self, method, url, headers, kwargs):
+        if self.rate_limiters:
+            limiter = self.rate_limiters.get(urlsplit(url).netloc)
+            if limiter is not None:
+                limiter.acquire()
+        if self.metrics is None:
+            return self.session.request(method, url, headers=headers, **kwargs)
+        return self._send_instrumented(method, url, headers, kwargs)
+
+    def _send_instrumented(self, method, url, headers, kwargs):
+        endpoint = endpoint_template(urlsplit(url).path)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, headers=headers, **kwargs)
+        except requests.exceptions.RequestException:
+            self.metrics.record_request(method, endpoint, 'error', time.perf_counter() - start)
+            raise
+        elapsed = time.perf_counter() - start
+        bytes_sent = int(response.request.headers.get('Content-Length') or 0)
+        if kwargs.get('stream'):
+            # the body is not read yet, trust the announced length
+            bytes_received = int(response.headers.get('Content-Length') or 0)
+        else:
+            bytes_received = len(response.content)
+        retries = getattr(response.raw, 'retries', None)
+        self.metrics.record_request(method, endpoint, response.status_code, elapsed, bytes_sent, bytes_received,
+                                    len(retries.history) if retries is not None else 0)
+        return response
+
+    def _cached_request(self, url, auth, endpoint, request_headers, kwargs):
+        params = kwargs.get('params') or {}
+        key = (url, tuple(sorted(params.items())), self.token if auth == 'token' else auth)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if self.cache.fresh(entry):
+                return entry['response']
+            request_headers.update(self.cache.conditional_headers(entry))
+        response = self._send('GET', url, request_headers, kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(key)
+            return entry['response']
+        if response.status_code == 200:
+            self.cache.store(key, endpoint, response)
+        return response
+
+    def set_rate_limit(self, url, rate, burst=None):
+        """
+        Limit the request rate to a host.
+
+        Args:
+            url (str): Any URL of the host.
+            rate (float): The number of requests allowed per second, None to remove the limit.
+            burst (int): The number of requests allowed back to back.
+        """
+        host = urlsplit(url).netloc
+        if rate is None:
+            self.rate_limiters.pop(host, None)
+        else:
+            self.rate_limiters[host] = rate_limiter(rate, burst)
+
+    def invalidate(self, endpoint=None, match=None):
+        """
+        Drop cached responses, see ``syntheticus_response_cache.invalidate``.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(endpoint, match)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+        self.session.close()
+
+
+def _rewind(kwargs):
+    """
+    Prepare the body of a request to be sent again.
+
+    Args:
+        kwargs (dict): The keyword arguments of the request.
+
+    Returns:
+        bool: False if the body is a one-shot stream that cannot be replayed.
+    """
+    data = kwargs.get('data')
+    if hasattr(data, 'rewind'):
+        data.rewind()
+    elif hasattr(data, 'read') or (data is not None and not isinstance(data, (str, bytes, dict, list, tuple))):
+        if not hasattr(data, 'seek'):
+            return False
+        data.seek(0)
+    for file in kwargs.get('files') or ():
+        content = file[1][1] if isinstance(file[1], tuple) else file[1]
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        elif hasattr(content, 'read'):
+            return False
+    return True
@@ -0,0 +1,237 @@
+import gzip
+import os
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from .syntheticus_csv import range_reader
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# file suffix and content type of every compression codec
+COMPRESSION_CODECS = {
+    'gzip': ('.gz', 'application/gzip'),
+    'zstd': ('.zst', 'application/zstd'),
+}
+
+
+class multipart_encoder:
+    """
+    A streaming multipart/form-data body.
+
+    The body is encoded incrementally while it is being sent: files are read from
+    disk with a fixed buffer, so memory stays flat regardless of the file sizes.
+    The total length is computed upfront, so the request is sent with a regular
+    Content-Length header rather than chunked transfer encoding. File handles are
+    opened one at a time and closed as soon as each file has been sent.
+
+    Example:
+        encoder = multipart_encoder({'dataset_folder_name': 'iris'},
+                                    [('files', 'iris.csv', './iris.csv', 'text/csv')])
+        session.post(url, data=encoder, headers={'Content-Type': encoder.content_type})
+    """
+    def __init__(self, fields, files, chunk_size=1024 * 1024, progress=None, boundary=None):
+        """
+        Initialize the encoder.
+
+        Args:
+            fields (dict): Plain form fields.
+            files (list): Tuples of (field name, file name, source, content type), where
+                source is a path on disk, a bytes object, or a (path, start, end, prefix)
+                tuple sending the prefix bytes followed by a byte range of the file.
+            chunk_size (int): The size of the buffer used to read files.
+            progress (callable): Optional callback called with (bytes sent, total bytes, bytes per second).
+            boundary (str): The multipart boundary, generated if not given.
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._parts = []
+        for name, value in fields.items():
+            header = self._part_header(name)
+            self._parts.append((header, str(value).encode(), None))
+        for name, file_name, source, content_type in files:
+            header = self._part_header(name, file_name, content_type)
+            if isinstance(source, bytes):
+                size = len(source)
+            elif isinstance(source, tuple):
+                path, start, end, prefix = source
+                size = len(prefix) + end - start
+            else:
+                size = os.path.getsize(source)
+            self._parts.append((header, source, size))
+        self._closing = f'--{self.boundary}--\r\n'.encode()
+        self.len = sum(len(header) + (len(source) if size is None else size) + 2
+                       for header, source, size in self._parts) + len(self._closing)
+        self.rewind()
+
+    def _part_header(self, name, file_name=None, content_type=None):
+        disposition = f'form-data; name="{name}"'
+        if file_name is not None:
+            disposition += f'; filename="{file_name}"'
+        header = f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\n'
+        if content_type:
+            header += f'Content-Type: {content_type}\r\n'
+        return (header + '\r\n').encode()
+
+    def _iter_chunks(self):
+        for header, source, size in self._parts:
+            yield header
+            if size is None or isinstance(source, bytes):
+                yield source
+            else:
+                opened = range_reader(*source) if isinstance(source, tuple) else open(source, 'rb')
+                with opened as f:
+                    while True:
+                        chunk = f.read(self.chunk_size)
+                        if not chunk:
+                            break
+                        yield chunk
+            yield b'\r\n'
+        yield self._closing
+
+    def __len__(self):
+        return self.len
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def read(self, size=-1):
+        """
+        Read up to ``size`` bytes of the encoded body.
+
+        Args:
+            size (int): The maximum number of bytes to return, -1 for everything left.
+
+        Returns:
+            bytes: The next part of the body, empty once the body is exhausted.
+        """
+        while (size < 0 or len(self._buffer) < size) and self._chunks is not None:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                self._chunks = None
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._sent += len(data)
+        if self.progress and data:
+            elapsed = time.monotonic() - self._started
+            self.progress(self._sent, self.len, self._sent / elapsed if elapsed > 0 else 0.0)
+        return data
+
+    def rewind(self):
+        """
+        Restart the body from the beginning, closing any file being read.
+        """
+        self.close()
+        self._chunks = self._iter_chunks()
+        self._buffer = bytearray()
+        self._sent = 0
+        self._started = time.monotonic()
+
+    def close(self):
+        """
+        Close the file currently being read, if any.
+        """
+        chunks = getattr(self, '_chunks', None)
+        if chunks is not None:
+            chunks.close()
+        self._chunks = None
+
+
+def print_progress(interval=1.0):
+    """
+    Build a progress callback printing the upload throughput.
+
+    Args:
+        interval (float): The minimum number of seconds between two printed lines.
+
+    Returns:
+        callable: A callback suitable for ``multipart_encoder``.
+    """
+    last = [0.0]
+
+    def progress(sent, total, rate):
+        now = time.monotonic()
+        if now - last[0] >= interval or sent == total:
+            last[0] = now
+            print(f"Uploaded {sent / 1e6:.1f}/{total / 1e6:.1f} MB ({rate / 1e6:.1f} MB/s)")
+    return progress
+
+
+def resolve_codec(codec):
+    """
+    Pick the compression codec to use.
+
+    Args:
+        codec (str): 'gzip', 'zstd', or 'auto' for zstd when zstandard is installed and gzip otherwise.
+
+    Returns:
+        str: The codec name.
+    """
+    if codec == 'auto':
+        return 'zstd' if zstandard is not None else 'gzip'
+    if codec not in COMPRESSION_CODECS:
+        raise ValueError(f"Unsupported compression: {codec}. Options are 'auto', {', '.join(COMPRESSION_CODECS)}.")
+    if codec == 'zstd' and zstandard is None:
+        raise ImportError("zstd compression requires zstandard: pip install syntheticus_connect[zstd]")
+    return codec
+
+
+def compress_file(path, dest, codec='gzip', chunk_size=1024 * 1024):
+    """
+    Compress a file into another one, streaming with a fixed buffer.
+
+    Args:
+        path (str): The file to compress.
+        dest (str): The compressed file.
+        codec (str): 'gzip' or 'zstd'.
+        chunk_size (int): The size of the read buffer.
+
+    Returns:
+        str: The compressed file.
+    """
+    with open(path, 'rb') as src:
+        if codec == 'zstd':
+            with open(dest, 'wb') as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst, read_size=chunk_size, write_size=chunk_size)
+        else:
+            with gzip.open(dest, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, chunk_size)
+    return dest
+
+
+def compress_files(paths, dest_dir, codec='gzip', max_workers=4, chunk_size=1024 * 1024):
+    """
+    Compress several files in parallel.
+
+    zlib and zstandard release the GIL while compressing, so threads compress
+    files on separate cores.
+
+    Args:
+        paths (list): The files to compress.
+        dest_dir (str): The directory receiving the compressed files.
+        codec (str): 'gzip' or 'zstd'.
+        max_workers (int): The number of files compressed at the same time.
+        chunk_size (int): The size of the read buffer.
+
+    Returns:
+        dict: The compressed file of every path.
+    """
+    suffix = COMPRESSION_CODECS[codec][0]
+    dests = [os.path.join(dest_dir, os.path.basename(path) + suffix) for path in paths]
+    if len(paths) <= 1 or max_workers <= 1:
+        return {path: compress_file(path, dest, codec, chunk_size) for path, dest in zip(paths, dests)}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+        futures = [executor.submit(compress_file, path, dest, codec, chunk_size) for path, dest in zip(paths, dests)]
+        return {path: future.result() for path, future in zip(paths, futures)}